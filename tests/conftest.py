@@ -0,0 +1,22 @@
+"""Общие настройки тестов Parser Service."""
+
+import os
+import signal
+from typing import Iterator
+
+import pytest
+
+# ParserConfig проверяет API-ключ при импорте parser_service; сетевые
+# запросы в тестах не выполняются, поэтому достаточно фиктивного значения
+os.environ.setdefault("EXCHANGERATE_API_KEY", "test-key")
+
+
+@pytest.fixture
+def restore_signal_handlers() -> Iterator[None]:
+    """Вернуть обработчики SIGINT/SIGTERM, заменённые RatesScheduler."""
+    handlers = {
+        signum: signal.getsignal(signum) for signum in (signal.SIGINT, signal.SIGTERM)
+    }
+    yield
+    for signum, handler in handlers.items():
+        signal.signal(signum, handler)
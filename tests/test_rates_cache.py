@@ -0,0 +1,82 @@
+"""Тесты отложенной записи RatesCache."""
+
+import json
+import time
+from pathlib import Path
+
+from valutatrade_hub.parser_service.rates_cache import RatesCache
+
+
+def _pairs_on_disk(filepath: Path) -> dict:
+    """Прочитать пары из файла кэша (пустой словарь, если файла ещё нет)."""
+    if not filepath.exists():
+        return {}
+    with open(filepath, encoding="utf-8") as f:
+        return json.load(f)["pairs"]
+
+
+def test_debounced_updates_are_written_by_flush(tmp_path: Path) -> None:
+    """Серия обновлений откладывается и записывается одним flush()."""
+    filepath = tmp_path / "rates.json"
+    cache = RatesCache(str(filepath))
+    cache._flush_delay_seconds = 60.0  # Таймер не успеет сработать сам
+
+    for i in range(3):
+        assert cache.update_rate("BTC_USD", 50000.0 + i, "CoinGecko")
+    cache.update_rate("EUR_USD", 1.08, "ExchangeRate")
+
+    # До flush() изменения только в памяти
+    assert "BTC_USD" not in _pairs_on_disk(filepath)
+
+    cache.flush()
+    pairs = _pairs_on_disk(filepath)
+    assert pairs["BTC_USD"]["rate"] == 50002.0
+    assert pairs["EUR_USD"]["rate"] == 1.08
+
+    # Новый экземпляр читает записанный файл
+    reloaded = RatesCache(str(filepath))
+    rate_info = reloaded.get_rate("BTC", "USD")
+    assert rate_info is not None
+    assert rate_info.rate == 50002.0
+    assert rate_info.source == "CoinGecko"
+    assert rate_info.is_fresh
+
+
+def test_flush_waits_for_background_write(tmp_path: Path) -> None:
+    """flush() возвращается только после записи, начатой фоновым потоком."""
+    filepath = tmp_path / "rates.json"
+    cache = RatesCache(str(filepath))
+    cache._flush_delay_seconds = 0.01
+
+    # Медленная запись: фоновый поток ещё пишет, когда вызывается flush()
+    atomic_write = cache._atomic_write_bytes
+
+    def slow_write(payload: bytes) -> None:
+        time.sleep(0.3)
+        atomic_write(payload)
+
+    cache._atomic_write_bytes = slow_write
+    cache.update_rate("ETH_USD", 3000.0, "CoinGecko")
+    time.sleep(0.1)
+
+    cache.flush()
+    assert _pairs_on_disk(filepath)["ETH_USD"]["rate"] == 3000.0
+
+
+def test_max_delay_forces_write_during_update_stream(tmp_path: Path) -> None:
+    """Непрерывные обновления не откладывают запись дольше предела."""
+    filepath = tmp_path / "rates.json"
+    cache = RatesCache(str(filepath))
+    cache._flush_delay_seconds = 0.2
+    cache._flush_max_delay_seconds = 0.3
+
+    # Обновления чаще окна debounce: без предела таймер сдвигался бы всегда
+    deadline = time.monotonic() + 1.0
+    rate = 1.0
+    while time.monotonic() < deadline:
+        cache.update_rate("SOL_USD", rate, "CoinGecko")
+        rate += 1.0
+        time.sleep(0.05)
+
+    assert "SOL_USD" in _pairs_on_disk(filepath)
+    cache.flush()
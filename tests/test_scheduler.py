@@ -0,0 +1,94 @@
+"""Тесты запуска и остановки RatesScheduler."""
+
+import dataclasses
+import threading
+import time
+from typing import List
+
+import pytest
+
+from valutatrade_hub.parser_service import scheduler as scheduler_module
+from valutatrade_hub.parser_service.scheduler import RatesScheduler
+from valutatrade_hub.parser_service.updater import UpdateResult, UpdateStatus
+
+
+class SlowUpdater:
+    """Заглушка RatesUpdater: каждое обновление длится duration секунд."""
+
+    def __init__(self, duration: float) -> None:
+        self.duration = duration
+        self.sources: List[str] = []
+        self.closed = False
+
+    def run_update_for_source(self, source_name: str) -> UpdateResult:
+        self.sources.append(source_name)
+        time.sleep(self.duration)
+        return UpdateResult(
+            status=UpdateStatus.SUCCESS,
+            total_rates=1,
+            updated_sources=[source_name],
+            failed_sources=[],
+            error_messages=[],
+        )
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _start_in_background(scheduler: RatesScheduler) -> None:
+    """Запустить планировщик не из основного потока (start() не блокирует)."""
+    starter = threading.Thread(target=scheduler.start)
+    starter.start()
+    starter.join()
+
+
+@pytest.mark.usefixtures("restore_signal_handlers")
+@pytest.mark.parametrize("allow_concurrent", [False, True])
+def test_start_stop_returns_within_timeout(
+    monkeypatch: pytest.MonkeyPatch, allow_concurrent: bool
+) -> None:
+    """stop() дожидается текущего обновления и укладывается в таймаут."""
+    monkeypatch.setattr(
+        scheduler_module,
+        "config",
+        dataclasses.replace(
+            scheduler_module.config, ALLOW_CONCURRENT_UPDATES=allow_concurrent
+        ),
+    )
+    updater = SlowUpdater(duration=0.3)
+    scheduler = RatesScheduler(updater)
+    scheduler.STOP_TIMEOUT_SECONDS = 5.0
+
+    _start_in_background(scheduler)
+    time.sleep(0.1)  # Первое обновление выполняется
+
+    started = time.monotonic()
+    scheduler.stop()
+    elapsed = time.monotonic() - started
+
+    assert elapsed < scheduler.STOP_TIMEOUT_SECONDS
+    assert not scheduler._sched_thread.is_alive()
+    assert not scheduler._sched.queue
+    assert updater.closed
+    status = scheduler.get_status()
+    assert not status.is_running
+    assert status.total_updates == len(updater.sources)
+    if allow_concurrent:
+        # Фиат и крипто выполняются одновременно в пуле потоков
+        assert sorted(updater.sources) == ["CoinGecko", "ExchangeRate"]
+
+
+@pytest.mark.usefixtures("restore_signal_handlers")
+def test_stop_without_running_update_is_immediate() -> None:
+    """Остановка простаивающего планировщика не ждет интервала обновления."""
+    updater = SlowUpdater(duration=0.0)
+    scheduler = RatesScheduler(updater)
+
+    _start_in_background(scheduler)
+    time.sleep(0.2)  # Первые обновления завершены, поток ждет интервала
+
+    started = time.monotonic()
+    scheduler.stop()
+    assert time.monotonic() - started < 1.0
+    assert not scheduler._sched_thread.is_alive()
+    assert sorted(updater.sources) == ["CoinGecko", "ExchangeRate"]
@@ -0,0 +1,64 @@
+"""Тесты журнала HistoryStorage: восстановление и сворачивание."""
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+from valutatrade_hub.parser_service.storage import HistoryStorage
+
+
+def _record(i: int, currency: str = "BTC") -> Dict[str, Any]:
+    """Собрать запись истории с уникальным временем."""
+    return {
+        "from_currency": currency,
+        "to_currency": "USD",
+        "rate": 100.0 + i,
+        "timestamp": f"2025-10-10T12:{i // 60:02d}:{i % 60:02d}.000001Z",
+        "source": "CoinGecko",
+        "meta": {"raw_id": "bitcoin", "request_ms": 5, "status_code": 200},
+    }
+
+
+def test_journal_is_replayed_after_crash(tmp_path: Path) -> None:
+    """Записи из журнала восстанавливаются без сворачивания в снимок."""
+    filepath = tmp_path / "exchange_rates.json"
+    storage = HistoryStorage(str(filepath))
+    saved_ids = storage.save_batch([_record(i) for i in range(3)])
+    storage.save_record(_record(3, "ETH"))
+
+    # Процесс "упал": close() не вызван, записи есть только в журнале
+    assert storage._journal_path.exists()
+    with open(storage._journal_path, "ab") as f:
+        f.write(b'{"id": "torn')  # Недописанная последняя строка
+
+    restored = HistoryStorage(str(filepath))
+    records = restored.load_all()
+    assert [r["id"] for r in records[:3]] == saved_ids
+    assert len(records) == 4
+    assert [r["rate"] for r in restored.get_by_currency("ETH")] == [103.0]
+    restored.close()
+
+
+def test_journal_is_compacted_at_threshold(tmp_path: Path) -> None:
+    """При достижении порога журнал сворачивается в основной файл."""
+    filepath = tmp_path / "exchange_rates.json"
+    storage = HistoryStorage(str(filepath))
+    storage.JOURNAL_COMPACT_THRESHOLD = 5
+
+    storage.save_batch([_record(i) for i in range(4)])
+    assert storage._journal_records == 4
+
+    storage.save_batch([_record(i) for i in range(4, 6)])
+    assert storage._journal_records == 0
+
+    # Снимок содержит все записи, а новый журнал ссылается на него
+    with open(filepath, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    assert snapshot["total_records"] == 6
+    assert len(snapshot["records"]) == 6
+
+    storage.save_record(_record(6))
+    reloaded = HistoryStorage(str(filepath))
+    assert len(reloaded.load_all()) == 7
+    reloaded.close()
+    storage.close()
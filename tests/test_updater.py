@@ -0,0 +1,68 @@
+"""Тесты RatesUpdater: обновление при сбое одного из источников."""
+
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+import pytest
+
+from valutatrade_hub.core.exceptions import ApiRequestError
+from valutatrade_hub.parser_service.storage import HistoryStorage
+from valutatrade_hub.parser_service.updater import RatesUpdater, UpdateStatus
+
+
+class FakeClient:
+    """API клиент с заранее заданным ответом (без сети)."""
+
+    def __init__(self, name: str, rates: Optional[Dict[str, float]] = None) -> None:
+        self.name = name
+        self.rates = rates
+        self.closed = False
+
+    def fetch_rates(self) -> Dict[str, float]:
+        if self.rates is None:
+            raise ApiRequestError(f"{self.name}: сервис недоступен")
+        return dict(self.rates)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_run_update_with_one_failing_client(tmp_path: Path) -> None:
+    """Курсы рабочего источника сохраняются, сбой другого отражен в статусе."""
+    cache_path = tmp_path / "rates.json"
+    storage = HistoryStorage(str(tmp_path / "exchange_rates.json"))
+    good = FakeClient("CoinGecko", {"BTC_USD": 50000.0, "ETH_USD": 3000.0})
+    bad = FakeClient("ExchangeRate")
+    updater = RatesUpdater([good, bad], storage, str(cache_path))
+
+    result = updater.run_update()
+
+    assert result.status is UpdateStatus.PARTIAL
+    assert result.total_rates == 2
+    assert result.updated_sources == ["CoinGecko"]
+    assert result.failed_sources == ["ExchangeRate"]
+    assert "сервис недоступен" in result.error_messages[0]
+
+    with open(cache_path, encoding="utf-8") as f:
+        pairs = json.load(f)["pairs"]
+    assert pairs["BTC_USD"]["rate"] == 50000.0
+    assert pairs["ETH_USD"]["source"] == "CoinGecko"
+
+    # История записана к моменту возврата run_update
+    assert sorted(r["from_currency"] for r in storage.load_all()) == ["BTC", "ETH"]
+
+    updater.close()
+    assert good.closed and bad.closed
+
+
+def test_run_update_raises_when_all_clients_fail(tmp_path: Path) -> None:
+    """Без единого курса run_update сообщает об ошибке всех источников."""
+    updater = RatesUpdater(
+        [FakeClient("CoinGecko"), FakeClient("ExchangeRate")],
+        cache_filepath=str(tmp_path / "rates.json"),
+    )
+    with pytest.raises(ApiRequestError):
+        updater.run_update()
+    assert not (tmp_path / "rates.json").exists()
+    updater.close()
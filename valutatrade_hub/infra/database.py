@@ -1,7 +1,6 @@
 """Модуль DatabaseManager - синглтон для работы с JSON-хранилищем данных."""
 
 import json
-import shutil
 from pathlib import Path
 from typing import Any, Optional
 import threading
@@ -53,13 +52,15 @@ class DatabaseManager:
         Returns:
             Единственный экземпляр класса DatabaseManager
         """
-        with cls._lock:
-            # Проверка наличия уже созданного экземпляра
-            if cls._instance is None:
-                # Создание нового экземпляра
-                cls._instance = super().__new__(cls)
-                # Флаг инициализации для контроля однократного вызова __init__
-                cls._instance._initialized = False
+        # Быстрый путь без блокировки: экземпляр уже создан
+        if cls._instance is None:
+            with cls._lock:
+                # Повторная проверка под блокировкой (double-checked locking)
+                if cls._instance is None:
+                    # Создание нового экземпляра
+                    cls._instance = super().__new__(cls)
+                    # Флаг инициализации для контроля однократного вызова __init__
+                    cls._instance._initialized = False
         return cls._instance
 
     def __init__(self) -> None:
@@ -82,6 +83,17 @@ class DatabaseManager:
         # Создание директории данных если она не существует
         self._data_path.mkdir(parents=True, exist_ok=True)
 
+        # Пути к файлам данных вычисляются один раз, а не при каждом вызове
+        self._users_path = self._data_path / self.USERS_FILE
+        self._portfolios_path = self._data_path / self.PORTFOLIOS_FILE
+        self._rates_path = self._data_path / self.RATES_FILE
+
+        # Пути к временным и backup файлам: {файл: (temp, backup)}
+        self._aux_paths: dict[Path, tuple[Path, Path]] = {
+            path: self._build_aux_paths(path)
+            for path in (self._users_path, self._portfolios_path, self._rates_path)
+        }
+
         # Установка флага инициализации
         self._initialized = True
 
@@ -94,8 +106,7 @@ class DatabaseManager:
         Raises:
             DatabaseError: При ошибках чтения или парсинга JSON
         """
-        filepath = self._data_path / self.USERS_FILE
-        return self._load_json(filepath, default=[])
+        return self._load_json(self._users_path, default=[])
 
     def save_users(self, users: list[dict]) -> None:
         """Сохранить данные пользователей в JSON файл.
@@ -106,8 +117,7 @@ class DatabaseManager:
         Raises:
             DatabaseError: При ошибках записи в файл
         """
-        filepath = self._data_path / self.USERS_FILE
-        self._save_json(filepath, users)
+        self._save_json(self._users_path, users)
 
     def load_portfolios(self) -> list[dict]:
         """Загрузить данные всех портфелей из JSON файла.
@@ -118,8 +128,7 @@ class DatabaseManager:
         Raises:
             DatabaseError: При ошибках чтения или парсинга JSON
         """
-        filepath = self._data_path / self.PORTFOLIOS_FILE
-        return self._load_json(filepath, default=[])
+        return self._load_json(self._portfolios_path, default=[])
 
     def save_portfolios(self, portfolios: list[dict]) -> None:
         """Сохранить данные портфелей в JSON файл.
@@ -130,8 +139,7 @@ class DatabaseManager:
         Raises:
             DatabaseError: При ошибках записи в файл
         """
-        filepath = self._data_path / self.PORTFOLIOS_FILE
-        self._save_json(filepath, portfolios)
+        self._save_json(self._portfolios_path, portfolios)
 
     def load_rates(self) -> dict:
         """Загрузить данные курсов валют из JSON файла.
@@ -142,8 +150,7 @@ class DatabaseManager:
         Raises:
             DatabaseError: При ошибках чтения или парсинга JSON
         """
-        filepath = self._data_path / self.RATES_FILE
-        return self._load_json(filepath, default={})
+        return self._load_json(self._rates_path, default={})
 
     def save_rates(self, rates: dict) -> None:
         """Сохранить данные курсов валют в JSON файл.
@@ -154,8 +161,7 @@ class DatabaseManager:
         Raises:
             DatabaseError: При ошибках записи в файл
         """
-        filepath = self._data_path / self.RATES_FILE
-        self._save_json(filepath, rates)
+        self._save_json(self._rates_path, rates)
 
     def _load_json(self, filepath: Path, default: Any = None) -> Any:
         """Загрузить данные из JSON файла с обработкой ошибок.
@@ -186,6 +192,21 @@ class DatabaseManager:
             # Общая ошибка чтения файла
             raise DatabaseError(f"Ошибка чтения файла {filepath}: {e}")
 
+    @staticmethod
+    def _build_aux_paths(filepath: Path) -> tuple[Path, Path]:
+        """Построить пути к временному и backup файлам для файла данных.
+
+        Args:
+            filepath: Путь к основному JSON файлу
+
+        Returns:
+            Кортеж (путь к .tmp файлу, путь к .backup файлу)
+        """
+        return (
+            filepath.with_suffix(filepath.suffix + ".tmp"),
+            filepath.with_suffix(filepath.suffix + ".backup"),
+        )
+
     def _save_json(self, filepath: Path, data: Any) -> None:
         """Атомарное сохранение данных в JSON файл с backup механизмом.
 
@@ -196,17 +217,24 @@ class DatabaseManager:
         Raises:
             DatabaseError: При ошибках записи в файл
         """
-        # Создание пути для backup файла (добавление .backup расширения)
-        backup_file = filepath.with_suffix(filepath.suffix + ".backup")
+        # Пути к временному и backup файлам (предвычислены для известных файлов)
+        aux_paths = self._aux_paths.get(filepath)
+        if aux_paths is None:
+            aux_paths = self._build_aux_paths(filepath)
+        temp_file, backup_file = aux_paths
 
-        # Создание пути для временного файла
-        temp_file = filepath.with_suffix(filepath.suffix + ".tmp")
+        # Флаг создания backup: по нему решаем, нужна ли очистка/восстановление
+        backup_created = False
 
         # Шаг 1: Создание backup существующего файла если он есть
         if filepath.exists():
+            # Ленивый импорт: shutil нужен только при перезаписи файла
+            import shutil
+
             try:
                 # Копирование существующего файла в backup
                 shutil.copy2(filepath, backup_file)
+                backup_created = True
             except Exception as e:
                 raise DatabaseError(f"Ошибка создания backup файла: {e}")
 
@@ -223,28 +251,23 @@ class DatabaseManager:
                 )
 
             # Шаг 3: Атомарная замена основного файла временным
+            # (os.replace перемещает temp, отдельное удаление не требуется)
             temp_file.replace(filepath)
 
-            # Шаг 4: Удаление временного файла (если замена прошла успешно)
-            if temp_file.exists():
-                temp_file.unlink(missing_ok=True)
-
         except Exception as e:
-            # Шаг 5: Восстановление из backup при ошибке
-            if backup_file.exists() and filepath.exists():
+            # Шаг 4: Восстановление из backup при ошибке
+            if backup_created:
                 try:
                     backup_file.replace(filepath)
+                    backup_created = False  # backup перемещён на место файла
                 except Exception as restore_error:
                     raise DatabaseError(
                         f"Ошибка записи и восстановления: {e}, "
                         f"восстановление не удалось: {restore_error}"
                     )
-            elif backup_file.exists():
-                # Если основного файла не было, просто удаляем backup
-                backup_file.unlink(missing_ok=True)
 
             raise DatabaseError(f"Ошибка сохранения данных в {filepath}: {e}")
         finally:
-            # Шаг 6: Удаление backup файла если операция успешна
-            if backup_file.exists():
+            # Шаг 5: Удаление backup файла (только если он был создан)
+            if backup_created:
                 backup_file.unlink(missing_ok=True)
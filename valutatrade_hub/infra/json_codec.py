@@ -0,0 +1,59 @@
+"""Модуль json_codec - быстрая (де)сериализация JSON с опциональным orjson."""
+
+import json
+from typing import Any, Callable, Optional
+
+try:
+    # orjson - опциональная зависимость: разбор JSON в несколько раз быстрее
+    import orjson
+except ImportError:  # orjson не установлен - используется стандартный json
+    orjson = None  # type: ignore[assignment]
+
+# Кодировщик стандартного json создается один раз: json.dumps с
+# нестандартными параметрами строит новый JSONEncoder при каждом вызове
+_STDLIB_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=True)
+
+
+def loads(data: bytes | memoryview | str) -> Any:
+    """Распарсить JSON из байтов, memoryview или строки.
+
+    Args:
+        data: JSON документ (например, response.content или содержимое файла;
+            memoryview над mmap разбирается orjson без копирования)
+
+    Returns:
+        Распарсенные данные (dict, list или скаляр)
+
+    Raises:
+        ValueError: При некорректном JSON (json.JSONDecodeError и
+            orjson.JSONDecodeError - подклассы ValueError)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()  # json.loads не принимает memoryview
+    return json.loads(data)
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Сериализовать данные в компактный JSON (UTF-8 байты).
+
+    Args:
+        obj: Данные из примитивных типов (dict, list, str, int, float, bool, None)
+        default: Преобразование несериализуемых значений (например, str)
+
+    Returns:
+        JSON без отступов и пробелов-разделителей
+
+    Raises:
+        TypeError: При несериализуемых типах данных (если default не указан)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default)
+    # ASCII-экранирование: быстрый путь C-энкодера стандартного json
+    encoder = _STDLIB_ENCODER
+    if default is not None:
+        encoder = json.JSONEncoder(
+            separators=(",", ":"), ensure_ascii=True, default=default
+        )
+    return encoder.encode(obj).encode("ascii")
@@ -1,10 +1,10 @@
 """Модуль SettingsLoader - синглтон для управления конфигурацией проекта."""
 
-import tomllib
+import os
 import threading
-import copy
 from pathlib import Path
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 
 
 class ConfigError(Exception):
@@ -42,6 +42,12 @@ class SettingsLoader:
     # Блокировка для обеспечения потокобезопасности при создании экземпляра
     _lock = threading.Lock()
 
+    # Переменная окружения с явным путём к pyproject.toml
+    CONFIG_ENV_VAR = "VALUTATRADE_CONFIG"
+
+    # Найденный путь к pyproject.toml (поиск выполняется один раз на процесс)
+    _cached_config_path: Optional[Path] = None
+
     def __new__(cls) -> "SettingsLoader":
         """Реализация паттерна Singleton через переопределение __new__.
 
@@ -53,13 +59,15 @@ class SettingsLoader:
             Гарантируется, что в приложении существует только один
             экземпляр SettingsLoader.
         """
-        with cls._lock:
-            # Проверка наличия уже созданного экземпляра
-            if cls._instance is None:
-                # Создание нового экземпляра через вызов родительского __new__
-                cls._instance = super().__new__(cls)
-                # Флаг инициализации для контроля однократного вызова __init__
-                cls._instance._initialized = False
+        # Быстрый путь без блокировки: экземпляр уже создан
+        if cls._instance is None:
+            with cls._lock:
+                # Повторная проверка под блокировкой (double-checked locking)
+                if cls._instance is None:
+                    # Создание нового экземпляра через вызов родительского __new__
+                    cls._instance = super().__new__(cls)
+                    # Флаг инициализации для контроля однократного вызова __init__
+                    cls._instance._initialized = False
         return cls._instance
 
     def __init__(self) -> None:
@@ -78,6 +86,9 @@ class SettingsLoader:
         # Приватный атрибут для хранения загруженной конфигурации
         self._config: Optional[dict] = None
 
+        # Неизменяемое представление конфигурации для all_settings
+        self._frozen_config: Optional[Mapping[str, Any]] = None
+
         # Загрузка конфигурации из файла
         self._load_config()
 
@@ -117,8 +128,23 @@ class SettingsLoader:
         self._load_config()
 
     @property
-    def all_settings(self) -> dict:
-        """Получить глубокую копию всех настроек конфигурации.
+    def all_settings(self) -> Mapping[str, Any]:
+        """Получить неизменяемое представление всех настроек конфигурации.
+        Returns:
+            Read-only отображение настроек из секции [tool.valutatrade]
+            (вложенные словари - MappingProxyType, списки - кортежи)
+        Raises:
+            RuntimeError: Если конфигурация не была загружена
+        """
+        # Проверка что конфигурация была загружена
+        if self._frozen_config is None:
+            raise RuntimeError("Конфигурация не была загружена")
+
+        # Представление построено один раз при загрузке - копирование не нужно
+        return self._frozen_config
+
+    def all_settings_copy(self) -> dict:
+        """Получить глубокую копию всех настроек для изменения вызывающим кодом.
         Returns:
             Словарь со всеми настройками из секции [tool.valutatrade]
         Raises:
@@ -128,11 +154,18 @@ class SettingsLoader:
         if self._config is None:
             raise RuntimeError("Конфигурация не была загружена")
 
+        # Ленивый импорт: copy нужен только этому редкому пути
+        import copy
+
         # Возвращаем глубокую копию чтобы защитить оригинальные данные
         return copy.deepcopy(self._config)
 
     def _find_config_file(self) -> Path:
-        """Найти файл конфигурации pyproject.toml в иерархии директорий.
+        """Найти файл конфигурации pyproject.toml.
+
+        Порядок поиска: переменная окружения VALUTATRADE_CONFIG, путь,
+        найденный ранее в этом процессе, каталоги над пакетом, затем
+        каталоги над текущей рабочей директорией.
 
         Returns:
             Объект Path указывающий на файл pyproject.toml
@@ -140,21 +173,29 @@ class SettingsLoader:
         Raises:
             ConfigError: Если файл pyproject.toml не найден
         """
-        # Начинаем поиск с текущей рабочей директории
-        current_dir = Path.cwd()
+        # Явно заданный путь не требует обхода файловой системы
+        env_path = os.environ.get(self.CONFIG_ENV_VAR)
+        if env_path:
+            return Path(env_path)
+
+        # Путь уже найден ранее - повторный обход не нужен
+        cls = type(self)
+        if cls._cached_config_path is not None:
+            return cls._cached_config_path
+
+        # Стабильная точка отсчёта - расположение пакета, а не CWD
+        package_dirs = Path(__file__).resolve().parents
+        cwd = Path.cwd()
 
-        # Поднимаемся вверх по иерархии директорий
-        while current_dir != current_dir.parent:
+        for directory in (*package_dirs, cwd, *cwd.parents):
             # Формирование пути к файлу конфигурации
-            config_file = current_dir / "pyproject.toml"
+            config_file = directory / "pyproject.toml"
 
             # Проверка существования файла
-            if config_file.exists():
+            if config_file.is_file():
+                cls._cached_config_path = config_file
                 return config_file
 
-            # Переход на уровень выше
-            current_dir = current_dir.parent
-
         # Файл не найден - выбрасываем исключение
         raise ConfigError("Файл конфигурации pyproject.toml не найден")
 
@@ -165,6 +206,9 @@ class SettingsLoader:
             ConfigError: При ошибках чтения файла или парсинга TOML
             ConfigError: Если секция [tool.valutatrade] отсутствует
         """
+        # Ленивый импорт: парсер TOML нужен только при (пере)загрузке конфига
+        import tomllib
+
         try:
             # Открытие файла в бинарном режиме для tomllib
             with open(self._config_path, "rb") as file:
@@ -181,3 +225,22 @@ class SettingsLoader:
 
         # Сохранение конфигурации из секции valutatrade
         self._config = config["tool"]["valutatrade"]
+
+        # Построение неизменяемого представления один раз на загрузку
+        self._frozen_config = _freeze(self._config)
+
+
+def _freeze(value: Any) -> Any:
+    """Рекурсивно преобразовать конфигурацию в неизменяемую структуру.
+
+    Args:
+        value: Значение из распарсенного TOML (dict, list или скаляр)
+
+    Returns:
+        MappingProxyType для словарей, tuple для списков, скаляр без изменений
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
@@ -3,8 +3,9 @@
 import logging
 import logging.handlers
 import json
+import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
 from .infra.settings import SettingsLoader, ConfigError
 
@@ -77,6 +78,94 @@ class JSONFormatter(logging.Formatter):
         return json.dumps(log_data, ensure_ascii=False)
 
 
+class SizeCachedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler с учётом размера файла в памяти.
+
+    Стандартный handler перед каждой записью проверяет тип файла (stat),
+    делает seek/tell и повторно форматирует запись. Этот handler ведёт
+    счётчик записанных байт и обращается к стандартной проверке только
+    когда счётчик достигает maxBytes.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Инициализация handler, параметры как у RotatingFileHandler."""
+        super().__init__(*args, **kwargs)
+        # Размер файла в байтах (None - ещё не определён)
+        self._bytes_written: Optional[int] = None
+        # Последняя отформатированная строка (для учёта размера в emit)
+        self._last_message: Optional[str] = None
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Отформатировать запись и запомнить строку для учёта размера.
+
+        Args:
+            record: Объект записи лога из модуля logging
+
+        Returns:
+            Отформатированная строка лога
+        """
+        msg = super().format(record)
+        self._last_message = msg
+        return msg
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Записать запись в файл и учесть её размер в счётчике.
+
+        Args:
+            record: Объект записи лога из модуля logging
+
+        Note:
+            Счётчик увеличивается после записи: format() вызывается и
+            стандартной проверкой ротации, поэтому учёт в нём считал бы
+            одну запись дважды.
+        """
+        super().emit(record)
+        msg = self._last_message
+        self._last_message = None
+        if msg is None or self._bytes_written is None:
+            return
+        # Для ASCII длина строки равна размеру в байтах - без кодирования
+        if msg.isascii():
+            size = len(msg)
+        else:
+            size = len(msg.encode(self.encoding or "utf-8"))
+        self._bytes_written += size + 1  # +1 за перевод строки
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        """Определить необходимость ротации по счётчику размера.
+
+        Args:
+            record: Объект записи лога из модуля logging
+
+        Returns:
+            True если файл нужно ротировать перед записью
+        """
+        if self.maxBytes <= 0:
+            return False
+
+        # Начальный размер берём из файла один раз
+        if self._bytes_written is None:
+            try:
+                self._bytes_written = os.path.getsize(self.baseFilename)
+            except OSError:
+                self._bytes_written = 0
+
+        if self._bytes_written < self.maxBytes:
+            return False
+
+        # Порог достигнут - точная проверка стандартным способом
+        should_rollover = bool(super().shouldRollover(record))
+        if not should_rollover and self.stream is not None:
+            # Файл мог быть ротирован извне - синхронизируем счётчик
+            self._bytes_written = self.stream.tell()
+        return should_rollover
+
+    def doRollover(self) -> None:
+        """Выполнить ротацию файла и сбросить счётчик размера."""
+        super().doRollover()
+        self._bytes_written = 0
+
+
 def setup_logging() -> None:
     """Основная функция настройки системы логирования.
 
@@ -117,7 +206,7 @@ def setup_logging() -> None:
 
         # Создание основного файлового handler с ротацией по размеру
         main_log_file = logs_dir / "valutatrade.log"
-        main_file_handler = logging.handlers.RotatingFileHandler(
+        main_file_handler = SizeCachedRotatingFileHandler(
             filename=main_log_file,  # Путь к основному файлу логов
             maxBytes=log_max_size_mb * 1024 * 1024,  # Макс. размер в байтах
             backupCount=log_backup_count,  # Количество backup файлов
@@ -169,6 +258,45 @@ def setup_logging() -> None:
         raise RuntimeError(f"Не удалось настроить логирование: {e}")
 
 
+# Специализированные логгеры: имя -> (файл, макс. размер в МБ, число backup,
+# фиксированный уровень или None для уровня из конфигурации)
+_SPECIALIZED_LOGGERS: Dict[str, Tuple[str, int, int, Optional[int]]] = {
+    # Доменные операции (buy, sell, register, login)
+    "actions": ("actions.log", 10, 5, None),
+    # Ошибки (только ERROR и выше)
+    "errors": ("errors.log", 5, 3, logging.ERROR),
+    # Операции с базой данных
+    "database": ("database.log", 5, 3, None),
+    # API операции
+    "api": ("api.log", 5, 3, None),
+}
+
+
+def _make_handler(
+    filename: Path, max_mb: int, backup_count: int, formatter: logging.Formatter
+) -> SizeCachedRotatingFileHandler:
+    """Создать файловый handler с ротацией и отложенным открытием файла.
+
+    Args:
+        filename: Путь к файлу логов
+        max_mb: Максимальный размер файла в мегабайтах
+        backup_count: Количество backup файлов
+        formatter: Общий форматтер для записи логов
+
+    Returns:
+        Handler с ротацией, который открывает файл только при первой записи
+    """
+    handler = SizeCachedRotatingFileHandler(
+        filename=filename,
+        maxBytes=max_mb * 1024 * 1024,
+        backupCount=backup_count,
+        encoding="utf-8",
+        delay=True,  # Файловый дескриптор создаётся при первом emit
+    )
+    handler.setFormatter(formatter)
+    return handler
+
+
 def _setup_specialized_loggers(
     logs_dir: Path, formatter: logging.Formatter, log_level: int
 ) -> None:
@@ -179,62 +307,12 @@ def _setup_specialized_loggers(
         formatter: Форматтер для записи логов
         log_level: Числовой уровень логирования
     """
-    # Логгер для доменных операций (buy, sell, register, login)
-    actions_logger = logging.getLogger("actions")
-    actions_logger.setLevel(log_level)
-    actions_logger.propagate = False  # Отключаем propagation в root логгер
-
-    actions_file = logs_dir / "actions.log"
-    actions_handler = logging.handlers.RotatingFileHandler(
-        filename=actions_file,
-        maxBytes=10 * 1024 * 1024,  # 10 МБ для файла действий
-        backupCount=5,  # 5 backup файлов
-        encoding="utf-8",
-    )
-    actions_handler.setFormatter(formatter)
-    actions_logger.addHandler(actions_handler)
-
-    # Логгер для ошибок (только ERROR и выше)
-    errors_logger = logging.getLogger("errors")
-    errors_logger.setLevel(logging.ERROR)  # Только ошибки
-    errors_logger.propagate = False
-
-    errors_file = logs_dir / "errors.log"
-    errors_handler = logging.handlers.RotatingFileHandler(
-        filename=errors_file,
-        maxBytes=5 * 1024 * 1024,  # 5 МБ для файла ошибок
-        backupCount=3,  # 3 backup файла
-        encoding="utf-8",
-    )
-    errors_handler.setFormatter(formatter)
-    errors_logger.addHandler(errors_handler)
-
-    # Логгер для операций с базой данных
-    database_logger = logging.getLogger("database")
-    database_logger.setLevel(log_level)
-    database_logger.propagate = False
-
-    database_file = logs_dir / "database.log"
-    database_handler = logging.handlers.RotatingFileHandler(
-        filename=database_file,
-        maxBytes=5 * 1024 * 1024,  # 5 МБ для файла БД
-        backupCount=3,
-        encoding="utf-8",
-    )
-    database_handler.setFormatter(formatter)
-    database_logger.addHandler(database_handler)
-
-    # Логгер для API операций (будущее использование)
-    api_logger = logging.getLogger("api")
-    api_logger.setLevel(log_level)
-    api_logger.propagate = False
-
-    api_file = logs_dir / "api.log"
-    api_handler = logging.handlers.RotatingFileHandler(
-        filename=api_file,
-        maxBytes=5 * 1024 * 1024,  # 5 МБ для файла API
-        backupCount=3,
-        encoding="utf-8",
-    )
-    api_handler.setFormatter(formatter)
-    api_logger.addHandler(api_handler)
+    for name, (filename, max_mb, backup_count, level) in _SPECIALIZED_LOGGERS.items():
+        logger = logging.getLogger(name)
+        logger.setLevel(level if level is not None else log_level)
+        logger.propagate = False  # Отключаем propagation в root логгер
+
+        # Handler открывает файл только когда логгер действительно пишет
+        logger.addHandler(
+            _make_handler(logs_dir / filename, max_mb, backup_count, formatter)
+        )
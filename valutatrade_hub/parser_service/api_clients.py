@@ -3,17 +3,81 @@
 """
 
 import logging
+import socket
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, FrozenSet, Mapping, Optional, Sequence, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
 
 from valutatrade_hub.core.exceptions import ApiRequestError
+from valutatrade_hub.infra import json_codec
 from .config import config  # ParserConfig с API-ключами и FIAT_CURRENCIES
 
 
+class _SocketOptionsAdapter(HTTPAdapter):
+    """HTTPAdapter, передающий заданные опции сокета в пул соединений urllib3."""
+
+    def __init__(
+        self, socket_options: Sequence[Tuple[int, int, int]], **kwargs: Any
+    ) -> None:
+        """Инициализация адаптера.
+
+        Args:
+            socket_options: Опции сокета в формате (level, optname, value)
+            **kwargs: Параметры HTTPAdapter (pool_connections, pool_maxsize и т.д.)
+        """
+        # Опции нужны до super().__init__, который вызывает init_poolmanager
+        self.socket_options = list(socket_options)
+        super().__init__(**kwargs)
+
+    def init_poolmanager(
+        self, connections: int, maxsize: int, block: bool = False, **pool_kwargs: Any
+    ) -> None:
+        """Создать пул соединений с опциями сокета адаптера."""
+        pool_kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+
 class BaseApiClient(ABC):
     """Абстрактный базовый класс для всех API клиентов валютных курсов."""
 
+    # Фиксированный набор атрибутов экземпляра (без __dict__ на экземпляр)
+    __slots__ = (
+        "name",
+        "timeout",
+        "max_retries",
+        "logger",
+        "session",
+        "_cache",
+        "_validators",
+    )
+
+    # Опции сокетов соединений (заменяют стандартные опции urllib3):
+    # TCP_NODELAY отключает алгоритм Нейгла - короткий GET уходит без задержки
+    SOCKET_OPTIONS: Tuple[Tuple[int, int, int], ...] = (
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    )
+
+    # Лимиты пула keep-alive соединений: число пулов по хостам и
+    # максимум соединений к одному хосту
+    POOL_CONNECTIONS: int = 8
+    POOL_MAXSIZE: int = 16
+
+    # Повторные попытки: пауза backoff_factor * 2^(n-1) секунд между ними,
+    # повтор также при перегрузке сервера и превышении лимита запросов
+    RETRY_BACKOFF_FACTOR: float = 0.3
+    # Случайная добавка к паузе (до N секунд): повторы после общего сбоя
+    # не приходят к API одновременно
+    RETRY_BACKOFF_JITTER: float = 0.5
+    RETRY_STATUS_FORCELIST: Tuple[int, ...] = (429, 502, 503, 504)
+
+    # Время жизни ответа API в памяти клиента (повторный запрос в пределах
+    # TTL, например от планировщика и CLI подряд, не идёт в сеть)
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+
     def __init__(self, name: str, timeout: int = 10, max_retries: int = 1) -> None:
         """Инициализация API клиента.
 
@@ -30,6 +94,71 @@ class BaseApiClient(ABC):
         self.max_retries = max_retries  # Максимальное количество повторных попыток
         # Инициализация логгера с именем 'parser.{name}' для системного логирования
         self.logger = logging.getLogger(f"parser.{name.lower()}")
+        # HTTP-сессия с пулом keep-alive соединений (без повторного TLS handshake)
+        self.session = self._create_session()
+        # Кэш ответов: (url, параметры) -> (время получения по monotonic, данные)
+        self._cache: Dict[
+            Tuple[str, FrozenSet[Tuple[str, Any]]], Tuple[float, Dict[str, Any]]
+        ] = {}
+        # Валидаторы последнего ответа 200: (url, параметры) ->
+        # (заголовки If-None-Match/If-Modified-Since, распарсенные данные)
+        self._validators: Dict[
+            Tuple[str, FrozenSet[Tuple[str, Any]]],
+            Tuple[Dict[str, str], Dict[str, Any]],
+        ] = {}
+
+    def _create_session(self) -> requests.Session:
+        """Создать HTTP-сессию клиента с пулом соединений.
+
+        Returns:
+            Сессия requests с заголовком идентификации и смонтированным адаптером
+
+        Note:
+            Повторные попытки (таймауты, ошибки соединения и статусы из
+            RETRY_STATUS_FORCELIST) выполняет адаптер с экспоненциальной паузой
+            и учётом заголовка Retry-After.
+        """
+        session = requests.Session()
+        session.headers.update(
+            {
+                "User-Agent": "ValutaTradeHub/1.0",
+                # Сжатый ответ; requests распаковывает его прозрачно
+                "Accept-Encoding": "gzip, deflate",
+            }
+        )
+        adapter = _SocketOptionsAdapter(
+            self.SOCKET_OPTIONS,
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=self._create_retry(),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _create_retry(self) -> Retry:
+        """Создать политику повторных попыток urllib3 для адаптера сессии.
+
+        Returns:
+            Retry на max_retries повторов только для GET-запросов
+
+        Note:
+            raise_on_status=False: после исчерпания попыток возвращается
+            последний ответ, ошибку статуса формирует raise_for_status().
+        """
+        return Retry(
+            total=self.max_retries,
+            backoff_factor=self.RETRY_BACKOFF_FACTOR,
+            backoff_jitter=self.RETRY_BACKOFF_JITTER,
+            status_forcelist=self.RETRY_STATUS_FORCELIST,
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+            respect_retry_after_header=True,
+        )
+
+    def close(self) -> None:
+        """Закрыть HTTP-сессию клиента и освободить соединения пула."""
+        self.session.close()
 
     @abstractmethod
     def fetch_rates(self) -> Dict[str, float]:
@@ -59,69 +188,113 @@ class BaseApiClient(ABC):
             ApiRequestError: При ошибках сети, таймаутах или некорректном статусе ответа
 
         Note:
-            Метод включает механизм повторных попыток при таймаутах (max_retries).
+            Повторные попытки (max_retries) с backoff выполняет адаптер сессии.
             Все ошибки преобразуются в единый тип исключения ApiRequestError.
+            Ответ, полученный менее RESPONSE_CACHE_TTL_SECONDS назад для тех же
+            url и параметров, возвращается из памяти без сетевого запроса.
+            Иначе запрос отправляется условным (ETag/Last-Modified прошлого
+            ответа): при 304 Not Modified возвращаются ранее распарсенные
+            данные без загрузки и разбора тела.
         """
-        # Итерация по количеству попыток (основная + retries)
-        for attempt in range(self.max_retries + 1):
-            try:
-                # Логирование деталей запроса для отладки
-                self.logger.debug(
-                    f"Попытка запроса {attempt + 1}: {url} " f"с параметрами {params}"
-                )
-
-                # Выполнение HTTP GET запроса с таймаутом
-                response = requests.get(
-                    url,
-                    params=params,
-                    timeout=self.timeout,
-                    headers={
-                        "User-Agent": "ValutaTradeHub/1.0"
-                    },  # Заголовок идентификации
-                )
-
-                # Проверка HTTP статуса ответа (выбрасывает исключение при ошибке)
-                response.raise_for_status()
+        # Проверка кэша ответов перед обращением к сети
+        cache_key = (url, frozenset((params or {}).items()))
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            fetched_at, cached_data = cached
+            if time.monotonic() - fetched_at < self.RESPONSE_CACHE_TTL_SECONDS:
+                self.logger.debug("Ответ %s взят из кэша клиента", self.name)
+                return cached_data
 
-                # Парсинг JSON ответа от API
-                data = response.json()
+        try:
+            # Логирование деталей запроса для отладки (ленивое форматирование:
+            # строка собирается только при включённом уровне DEBUG)
+            self.logger.debug("Запрос: %s с параметрами %s", url, params)
+
+            # Условные заголовки по валидаторам прошлого ответа (если были)
+            validated = self._validators.get(cache_key)
+            headers = validated[0] if validated is not None else None
+
+            # HTTP GET через сессию (keep-alive соединение); повторные попытки
+            # с экспоненциальной паузой выполняет адаптер сессии
+            response = self.session.get(
+                url, params=params, headers=headers, timeout=self.timeout
+            )
+
+            # Данные не изменились - повторное использование прошлого разбора
+            if response.status_code == 304 and validated is not None:
+                self.logger.debug("Ответ %s не изменился (304)", self.name)
+                self._cache[cache_key] = (time.monotonic(), validated[1])
+                return validated[1]
+
+            # Проверка HTTP статуса ответа (выбрасывает исключение при ошибке)
+            response.raise_for_status()
+
+            # Парсинг JSON ответа от API (orjson если установлен)
+            data = json_codec.loads(response.content)
+            # Размер тела ответа без сериализации распарсенных данных в строку:
+            # raw.tell() - байты, прочитанные из сокета (до распаковки gzip),
+            # len(content) - размер тела после распаковки
+            if self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug(
-                    f"Получен ответ от {self.name}: {len(str(data))} байт"
-                )
-                return data  # Успешный возврат данных
-
-            except requests.exceptions.Timeout as e:
-                # Обработка таймаута с логированием и повторной попыткой
-                if attempt == self.max_retries:
-                    # Исчерпаны все попытки - выбрасываем исключение
-                    raise ApiRequestError(
-                        f"{self.name}: таймаут запроса ({self.timeout} секунд)"
-                    ) from e
-                self.logger.warning(
-                    f"Таймаут, повторная попытка " f"({attempt + 1}/{self.max_retries})"
+                    "Получен ответ от %s: %d байт по сети, %d после распаковки",
+                    self.name,
+                    response.raw.tell(),
+                    len(response.content),
                 )
-
-            except requests.exceptions.RequestException as e:
-                # Обработка сетевых ошибок (connection error, SSL error и т.д.)
-                raise ApiRequestError(f"{self.name}: сетевая ошибка - {e}") from e
-
-            except ValueError as e:
-                # Ошибка декодирования JSON (некорректный ответ API)
+            # Сохранение ответа в кэш клиента
+            self._cache[cache_key] = (time.monotonic(), data)
+            # Запоминание валидаторов для следующего условного запроса
+            conditional: Dict[str, str] = {}
+            etag = response.headers.get("ETag")
+            if etag:
+                conditional["If-None-Match"] = etag
+            last_modified = response.headers.get("Last-Modified")
+            if last_modified:
+                conditional["If-Modified-Since"] = last_modified
+            if conditional:
+                self._validators[cache_key] = (conditional, data)
+            return data  # Успешный возврат данных
+
+        except requests.exceptions.Timeout as e:
+            # Таймаут после исчерпания всех попыток
+            raise ApiRequestError(
+                f"{self.name}: таймаут запроса ({self.timeout} секунд)"
+            ) from e
+
+        except requests.exceptions.RequestException as e:
+            # Таймаут чтения после исчерпания повторов адаптера requests
+            # оборачивает в ConnectionError(MaxRetryError(ReadTimeoutError))
+            reason = getattr(e.args[0], "reason", None) if e.args else None
+            if isinstance(reason, ReadTimeoutError):
                 raise ApiRequestError(
-                    f"{self.name}: некорректный JSON в ответе - {e}"
+                    f"{self.name}: таймаут запроса ({self.timeout} секунд)"
                 ) from e
+            # Обработка сетевых ошибок (connection error, SSL error и т.д.)
+            raise ApiRequestError(f"{self.name}: сетевая ошибка - {e}") from e
 
-        # Защита от недостижимого кода (должно быть обработано в except блоке)
-        raise ApiRequestError(f"{self.name}: неожиданная ошибка в _make_request()")
+        except ValueError as e:
+            # Ошибка декодирования JSON (некорректный ответ API)
+            raise ApiRequestError(
+                f"{self.name}: некорректный JSON в ответе - {e}"
+            ) from e
 
 
 class CoinGeckoClient(BaseApiClient):
     """Клиент для работы с CoinGecko API для получения курсов криптовалют."""
 
-    # Временные константы (будут перенесены в config.py в задаче 4.1.1)
-    COINGECKO_URL: str = "https://api.coingecko.com/api/v3/simple/price"
-    CRYPTO_CURRENCIES: list[str] = ["BTC", "ETH"]  # Поддерживаемые криптовалюты
-    CRYPTO_ID_MAP: Dict[str, str] = {"BTC": "bitcoin", "ETH": "ethereum"}
+    __slots__ = (
+        "crypto_currencies",
+        "crypto_id_map",
+        "_id_to_code",
+        "_quote_suffixes",
+        "_params",
+    )
+
+    # Крипто-курсы меняются быстро - короткое время жизни кэша ответа
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+
+    # URL эндпоинта simple/price из конфигурации парсера
+    COINGECKO_URL: str = config.COINGECKO_URL
 
     def __init__(self, timeout: int = 10, max_retries: int = 1) -> None:
         """Инициализация CoinGecko клиента.
@@ -130,64 +303,82 @@ class CoinGeckoClient(BaseApiClient):
             timeout: Таймаут запроса в секундах (по умолчанию 10)
             max_retries: Максимальное количество повторных попыток (по умолчанию 1)
 
+        Raises:
+            ApiRequestError: Если для криптовалюты из конфигурации нет CoinGecko ID
+
         Note:
             Имя клиента фиксировано как "CoinGecko" для корректного логирования.
+            Параметры запроса статичны и собираются один раз.
         """
         # Вызов конструктора родительского класса с фиксированным именем
         super().__init__(name="CoinGecko", timeout=timeout, max_retries=max_retries)
 
+        # Единый источник списка криптовалют и маппинга тикер -> CoinGecko ID
+        self.crypto_currencies: Tuple[str, ...] = config.CRYPTO_CURRENCIES
+        self.crypto_id_map: Mapping[str, str] = config.CRYPTO_ID_MAP
+        # Обратный маппинг ID -> код (bitcoin -> BTC), строится один раз
+        self._id_to_code: Dict[str, str] = {
+            coin_id: code for code, coin_id in self.crypto_id_map.items()
+        }
+
+        # Проверка маппинга один раз при создании, а не на каждом запросе
+        missing = [c for c in self.crypto_currencies if c not in self.crypto_id_map]
+        if missing:
+            raise ApiRequestError(f"Неизвестные коды криптовалют: {missing}")
+
+        # Валюты котировки и суффиксы ключей пар: ("usd", "_USD"), ...
+        self._quote_suffixes: Tuple[Tuple[str, str], ...] = tuple(
+            (quote, f"_{quote.upper()}") for quote in config.QUOTE_CURRENCIES
+        )
+
+        # Параметры запроса: ID и валюты котировки через запятую - все пары
+        # получаются за один HTTP-запрос
+        self._params: Dict[str, str] = {
+            "ids": ",".join(self.crypto_id_map[c] for c in self.crypto_currencies),
+            "vs_currencies": ",".join(config.QUOTE_CURRENCIES),
+        }
+
     def fetch_rates(self) -> Dict[str, float]:
         """Получить курсы криптовалют от CoinGecko API.
 
         Returns:
-            Словарь в формате {"CRYPTO_USD": rate}, например {"BTC_USD": 59337.21}
+            Словарь в формате {"CRYPTO_QUOTE": rate}, например {"BTC_USD": 59337.21}
 
         Raises:
             ApiRequestError: При ошибках API, сети или некорректных данных
 
         Note:
-            Метод преобразует коды валют (BTC) в CoinGecko IDs (bitcoin)
-            и парсит ответ API в стандартизированный формат.
+            Коды валют (BTC) преобразуются в CoinGecko IDs (bitcoin) в __init__;
+            метод парсит ответ API в стандартизированный формат.
         """
         # Логирование начала операции получения курсов
-        self.logger.info(f"Запрос курсов для {len(self.CRYPTO_CURRENCIES)} криптовалют")
-
-        # 1. Преобразование кодов валют в CoinGecko IDs
-        coin_ids: list[str] = []
-        for crypto_code in self.CRYPTO_CURRENCIES:
-            if crypto_code not in self.CRYPTO_ID_MAP:
-                # Ошибка если код валюты не найден в маппинге
-                raise ApiRequestError(f"Неизвестный код криптовалюты: {crypto_code}")
-            # Добавление соответствующего CoinGecko ID в список
-            coin_ids.append(self.CRYPTO_ID_MAP[crypto_code])
-
-        # 2. Подготовка параметров запроса
-        params: Dict[str, str] = {
-            "ids": ",".join(coin_ids),  # Объединение ID через запятую
-            "vs_currencies": "usd",  # Базовая валюта - USD
-        }
+        self.logger.info(
+            "Запрос курсов для %d криптовалют", len(self.crypto_currencies)
+        )
 
-        # 3. Выполнение запроса через родительский метод
-        response_data: Dict[str, Any] = self._make_request(self.COINGECKO_URL, params)
+        # Запрос с заранее подготовленными параметрами
+        response_data: Dict[str, Any] = self._make_request(
+            self.COINGECKO_URL, self._params
+        )
 
-        # 4. Валидация и преобразование данных ответа
+        # Валидация и преобразование данных ответа
         return self._parse_response(response_data)
 
     def _parse_response(self, data: Dict[str, Any]) -> Dict[str, float]:
         """Парсинг ответа CoinGecko API в стандартизированный формат.
 
         Args:
-            data: Ответ API в формате {"bitcoin": {"usd": 59337.21}}
+            data: Ответ API в формате {"bitcoin": {"usd": 59337.21, ...}}
 
         Returns:
-            Словарь в формате {"BTC_USD": 59337.21}
+            Словарь в формате {"BTC_USD": 59337.21, ...}
 
         Raises:
             ApiRequestError: При некорректной структуре ответа или данных
 
         Note:
             Метод выполняет обратное преобразование: bitcoin -> BTC
-            и создаёт пары валют в формате BTC_USD.
+            и создаёт пары валют BTC_USD для каждой валюты из QUOTE_CURRENCIES.
         """
         rates: Dict[str, float] = {}  # Инициализация словаря для результатов
 
@@ -195,40 +386,50 @@ class CoinGeckoClient(BaseApiClient):
         if not data:
             raise ApiRequestError("CoinGecko вернул пустой ответ")
 
-        # Создание обратного маппинга: ID -> код валюты (bitcoin -> BTC)
-        id_to_code: Dict[str, str] = {v: k for k, v in self.CRYPTO_ID_MAP.items()}
+        # Локальные ссылки на методы: без поиска атрибутов на каждой итерации
+        lookup_code = self._id_to_code.get  # bitcoin -> BTC (предвычислено)
+        validate_rate = self._validate_rate
+        warn = self.logger.warning
+
+        quote_suffixes = self._quote_suffixes
 
         # Итерация по всем монетам в ответе API
         for coin_id, price_data in data.items():
             # Проверка структуры данных для каждой монеты
-            if not isinstance(price_data, dict) or "usd" not in price_data:
+            if not isinstance(price_data, dict):
                 # Логирование предупреждения о некорректной структуре
-                self.logger.warning(f"Некорректная структура данных для {coin_id}")
+                warn("Некорректная структура данных для %s", coin_id)
                 continue  # Пропуск этой монеты, продолжение с следующей
 
-            # Получение значения курса из ответа
-            rate: Any = price_data["usd"]
-
-            # Валидация числового значения курса
-            if not self._validate_rate(rate, coin_id):
-                continue  # Пропуск невалидного курса
-
-            # Преобразование CoinGecko ID в код валюты и создание пары
-            if coin_id in id_to_code:
-                crypto_code: str = id_to_code[coin_id]  # Преобразование: bitcoin -> BTC
-                pair_key: str = f"{crypto_code}_USD"  # Формирование ключа: BTC_USD
-                rates[pair_key] = float(rate)  # Добавление курса в результаты
-                self.logger.debug(f"Получен курс: {pair_key} = {rate}")
-            else:
+            # Преобразование CoinGecko ID в код валюты
+            crypto_code: Optional[str] = lookup_code(coin_id)
+            if crypto_code is None:
                 # Логирование предупреждения о неизвестном ID
-                self.logger.warning(f"Неизвестный CoinGecko ID: {coin_id}")
+                warn("Неизвестный CoinGecko ID: %s", coin_id)
+                continue
+
+            # Курсы монеты во всех валютах котировки из одного ответа
+            for quote, suffix in quote_suffixes:
+                # Получение значения курса из ответа
+                rate: Any = price_data.get(quote)
+                if rate is None:
+                    warn("Нет курса %s для %s", quote, coin_id)
+                    continue
+
+                # Валидация числового значения курса
+                if not validate_rate(rate, coin_id):
+                    continue  # Пропуск невалидного курса
+
+                pair_key: str = crypto_code + suffix  # Ключ пары: BTC_USD
+                rates[pair_key] = float(rate)  # Добавление курса в результаты
+                self.logger.debug("Получен курс: %s = %s", pair_key, rate)
 
         # Проверка что получены хотя бы некоторые курсы
         if not rates:
             raise ApiRequestError("Не удалось получить ни одного курса из CoinGecko")
 
         # Логирование успешного завершения операции
-        self.logger.info(f"Получено {len(rates)} курсов от CoinGecko")
+        self.logger.info("Получено %d курсов от CoinGecko", len(rates))
         return rates  # Возврат словаря с курсами
 
     def _validate_rate(self, rate: Any, coin_id: str) -> bool:
@@ -251,25 +452,40 @@ class CoinGeckoClient(BaseApiClient):
 
             # Проверка что курс положительный
             if rate_float <= 0:
-                self.logger.warning(f"Неположительный курс для {coin_id}: {rate}")
+                self.logger.warning("Неположительный курс для %s: %s", coin_id, rate)
                 return False
 
             # Проверка реалистичных пределов (курс не превышает 1 млн USD)
             if rate_float > 1_000_000:
-                self.logger.warning(f"Слишком высокий курс для {coin_id}: {rate}")
+                self.logger.warning("Слишком высокий курс для %s: %s", coin_id, rate)
                 return False
 
             return True  # Курс прошел все проверки
 
         except (ValueError, TypeError):
             # Ошибка преобразования типа (не числовое значение)
-            self.logger.warning(f"Некорректный тип курса для {coin_id}: {type(rate)}")
+            self.logger.warning(
+                "Некорректный тип курса для %s: %s", coin_id, type(rate)
+            )
             return False
 
 
 class ExchangeRateApiClient(BaseApiClient):
     """Клиент ExchangeRate-API для фиатных курсов (ТЗ4 4.2.3)."""
 
+    __slots__ = ()  # Собственных атрибутов экземпляра нет
+
+    # Ответ /latest содержит ~160 валют: увеличенный буфер приёма позволяет
+    # получить его за одно чтение из сокета
+    SOCKET_OPTIONS: Tuple[Tuple[int, int, int], ...] = (
+        *BaseApiClient.SOCKET_OPTIONS,
+        (socket.SOL_SOCKET, socket.SO_RCVBUF, 256 * 1024),
+        (socket.SOL_SOCKET, socket.SO_SNDBUF, 64 * 1024),
+    )
+
+    # Фиатные курсы обновляются редко - кэш ответа живёт дольше
+    RESPONSE_CACHE_TTL_SECONDS: float = 60.0
+
     def __init__(self, timeout: int = 10, max_retries: int = 3) -> None:
         """Инициализация с параметрами таймаута и повторов."""
         super().__init__(name="ExchangeRate", timeout=timeout, max_retries=max_retries)
@@ -306,23 +522,25 @@ class ExchangeRateApiClient(BaseApiClient):
         result_rates: Dict[str, float] = {}
 
         # 6. Фильтрация по FIAT_CURRENCIES + валидация
+        # (методы привязаны к локальным именам вне цикла)
+        get_raw = raw_rates.get
+        warn = self.logger.warning
         for fiat_code in config.FIAT_CURRENCIES:
-            if fiat_code in raw_rates:
-                rate_raw = raw_rates[fiat_code]
-                try:
-                    rate_float = float(rate_raw)
-                    if rate_float > 0:  # Только положительные курсы
-                        pair = f"{fiat_code}_USD"
-                        result_rates[pair] = rate_float
-                    else:
-                        self.logger.warning(
-                            f"Отрицательный курс {fiat_code}: {rate_float}"
-                        )
-                except (ValueError, TypeError):
-                    self.logger.warning(f"Не число для {fiat_code}: {rate_raw}")
+            rate_raw = get_raw(fiat_code)
+            if rate_raw is None:
+                continue
+            try:
+                rate_float = float(rate_raw)
+            except (ValueError, TypeError):
+                warn("Не число для %s: %s", fiat_code, rate_raw)
+                continue
+            if rate_float > 0:  # Только положительные курсы
+                result_rates[f"{fiat_code}_USD"] = rate_float
+            else:
+                warn("Отрицательный курс %s: %s", fiat_code, rate_float)
 
         # 7. Логирование и проверка результата
-        self.logger.info(f"ExchangeRate: {len(result_rates)} курсов")
+        self.logger.info("ExchangeRate: %d курсов", len(result_rates))
         if not result_rates:
             raise ApiRequestError("Нет валидных фиатных курсов")
 
@@ -1,20 +1,20 @@
 """Конфигурация Parser Service для ТЗ4."""
 
-from dataclasses import dataclass  # dataclass для конфига
+from dataclasses import dataclass, field  # dataclass для конфига
 import os  # os.getenv для API-ключа
+from types import MappingProxyType  # Неизменяемое представление словаря
+from typing import Mapping
 
 
 @dataclass(frozen=True)  # Неизменяемый конфиг
 class ParserConfig:
     """Конфигурация парсера курсов валют."""
 
-    # API ключ из ENV (по умолчанию из ТЗ4)
-    EXCHANGERATE_API_KEY: str = os.getenv("d27515639de97f22e18f53d9", "")
-    if not EXCHANGERATE_API_KEY:
-        raise ValueError("""
-                Ошибка: переменная окружения EXCHANGERATE_API_KEY не установлена.
-                Добавьте её в .env файл или установите командой:
-                set EXCHANGERATE_API_KEY=ваш_ключ_сюда""")
+    # API ключ из переменной окружения EXCHANGERATE_API_KEY (читается при
+    # создании экземпляра, проверяется в __post_init__)
+    EXCHANGERATE_API_KEY: str = field(
+        default_factory=lambda: os.getenv("EXCHANGERATE_API_KEY", "")
+    )
 
     # Базовые URL эндпоинтов API
     EXCHANGERATE_API_URL: str = "https://v6.exchangerate-api.com/v6"
@@ -32,13 +32,21 @@ class ParserConfig:
         "ETH",
         "SOL",
     )
+    # Валюты котировки CoinGecko (vs_currencies): все запрашиваются
+    # одним HTTP-запросом, например ("usd", "eur")
+    QUOTE_CURRENCIES: tuple = ("usd",)
 
-    # Маппинг тикеров -> CoinGecko ID
-    CRYPTO_ID_MAP: dict = {
-        "BTC": "bitcoin",  # BTC -> bitcoin
-        "ETH": "ethereum",  # ETH -> ethereum
-        "SOL": "solana",  # SOL -> solana
-    }
+    # Маппинг тикеров -> CoinGecko ID (read-only: изменяемый dict
+    # недопустим как значение по умолчанию у dataclass)
+    CRYPTO_ID_MAP: Mapping[str, str] = field(
+        default_factory=lambda: MappingProxyType(
+            {
+                "BTC": "bitcoin",  # BTC -> bitcoin
+                "ETH": "ethereum",  # ETH -> ethereum
+                "SOL": "solana",  # SOL -> solana
+            }
+        )
+    )
 
     # Пути к файлам данных
     RATES_FILE_PATH: str = "data/rates.json"
@@ -52,22 +60,26 @@ class ParserConfig:
     UPDATE_TIMEOUT_SECONDS: int = 300
     ALLOW_CONCURRENT_UPDATES: bool = False
 
+    def __post_init__(self) -> None:
+        """Проверить наличие API-ключа ExchangeRate.
 
-# Глобальный экземпляр конфигурации
-config: ParserConfig = ParserConfig()
+        Raises:
+            ValueError: Если переменная окружения EXCHANGERATE_API_KEY не задана
+        """
+        if not self.EXCHANGERATE_API_KEY:
+            raise ValueError(
+                "❌ Не удалось загрузить API-ключ ExchangeRate.\n\n"
+                "Для работы с курсами валют необходимо:\n"
+                "1. Получите бесплатный ключ на https://www.exchangerate-api.com/\n"
+                "2. Установите его одним из способов:\n"
+                "   • Создайте файл '.env' в корне проекта и добавьте:\n"
+                "     EXCHANGERATE_API_KEY=ваш_ключ\n"
+                "   • Или установите через командную строку:\n"
+                "     Windows: set EXCHANGERATE_API_KEY=ваш_ключ\n"
+                "     Linux/Mac: export EXCHANGERATE_API_KEY=ваш_ключ\n\n"
+                "После установки перезапустите программу."
+            )
 
 
-def __post_init__(self) -> None:
-    if not self.EXCHANGERATE_API_KEY:
-        raise ValueError(
-            "❌ Не удалось загрузить API-ключ ExchangeRate.\n\n"
-            "Для работы с курсами валют необходимо:\n"
-            "1. Получите бесплатный ключ на https://www.exchangerate-api.com/\n"
-            "2. Установите его одним из способов:\n"
-            "   • Создайте файл '.env' в корне проекта и добавьте:\n"
-            "     EXCHANGERATE_API_KEY=ваш_ключ\n"
-            "   • Или установите через командную строку:\n"
-            "     Windows: set EXCHANGERATE_API_KEY=ваш_ключ\n"
-            "     Linux/Mac: export EXCHANGERATE_API_KEY=ваш_ключ\n\n"
-            "После установки перезапустите программу."
-        )
+# Глобальный экземпляр конфигурации
+config: ParserConfig = ParserConfig()
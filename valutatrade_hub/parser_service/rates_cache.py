@@ -2,16 +2,39 @@
 Модуль RatesCache - управление кэшем актуальных курсов валют (rates.json).
 """
 
+import atexit
+import errno
+import functools
+import hashlib
 import json
 import logging
-import shutil
-from datetime import datetime
+import mmap
+import os
+import queue
+import sys
+import threading
+import time
+import weakref
+import zlib
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from types import MappingProxyType
+from typing import Dict, Any, FrozenSet, List, Mapping, Optional, Tuple
 from dataclasses import dataclass
 
+from valutatrade_hub.infra import json_codec
 from valutatrade_hub.infra.settings import SettingsLoader
 
+# Безымянные временные файлы (Linux O_TMPFILE + linkat через /proc/self/fd);
+# сбрасывается в False при первой неудачной попытке
+_TMPFILE_SUPPORTED: bool = hasattr(os, "O_TMPFILE") and os.path.isdir("/proc/self/fd")
+
+# Ошибки, означающие что ФС, ядро или песочница не поддерживают O_TMPFILE или
+# linkat через /proc; прочие ошибки (EEXIST, ENOENT, EMFILE...) временные
+_TMPFILE_UNSUPPORTED_ERRNOS: FrozenSet[int] = frozenset(
+    {errno.EOPNOTSUPP, errno.EINVAL, errno.EISDIR, errno.EPERM, errno.EXDEV}
+)
+
 
 class CacheError(Exception):
     """Исключение для ошибок работы кэша курсов валют.
@@ -51,9 +74,24 @@ class RatesCache:
     # Константа версии формата данных кэша
     CACHE_VERSION: str = "1.0"
 
-    # Списки валют для классификации по типу
-    FIAT_CURRENCIES: List[str] = ["USD", "EUR", "RUB"]
-    CRYPTO_CURRENCIES: List[str] = ["BTC", "ETH"]
+    # Обязательные поля файла кэша и данных каждой пары
+    REQUIRED_TOP_FIELDS: Tuple[str, ...] = ("pairs", "last_refresh")
+    PAIR_REQUIRED_FIELDS: Tuple[str, ...] = ("rate", "updated_at", "source")
+
+    # Те же поля в виде множеств: проверка всех полей одним сравнением
+    # keys() >= set на уровне C вместо цикла по полям
+    _TOP_FIELDS_SET: FrozenSet[str] = frozenset(REQUIRED_TOP_FIELDS)
+    _PAIR_FIELDS_SET: FrozenSet[str] = frozenset(PAIR_REQUIRED_FIELDS)
+
+    # Хэш схемы: файлы с совпадающим хэшем записаны этим классом, поэтому
+    # при загрузке проверяется только верхний уровень без обхода пар
+    SCHEMA_HASH: str = hashlib.sha256(
+        f"{CACHE_VERSION}:{','.join(sorted(PAIR_REQUIRED_FIELDS))}".encode()
+    ).hexdigest()[:16]
+
+    # Наборы валют для классификации по типу (проверка вхождения за O(1))
+    FIAT_CURRENCIES: FrozenSet[str] = frozenset({"USD", "EUR", "RUB"})
+    CRYPTO_CURRENCIES: FrozenSet[str] = frozenset({"BTC", "ETH"})
 
     def __init__(self, filepath: str = "data/rates.json") -> None:
         """Инициализация кэша курсов валют.
@@ -75,6 +113,12 @@ class RatesCache:
         # Загрузка настроек TTL из SettingsLoader
         self.settings: SettingsLoader = SettingsLoader()
 
+        # TTL по типам валют разрешаются из настроек один раз
+        self._ttl_by_base: Dict[str, int] = {}
+        self._default_ttl: int = 1800
+        self._pair_ttl_cache: Dict[str, int] = {}
+        self._resolve_ttl_settings()
+
         # Создание директории если она не существует
         try:
             self.filepath.parent.mkdir(parents=True, exist_ok=True)
@@ -87,8 +131,70 @@ class RatesCache:
 
         # Инициализация данных кэша в памяти
         self._cache_data: Optional[Dict[str, Any]] = None
+
+        # Epoch времени обновления пар: pair -> (updated_at, epoch);
+        # только в памяти, в файл не записывается
+        self._updated_epochs: Dict[str, Tuple[str, float]] = {}
+
+        # Отложенная запись: обновления помечают кэш "грязным", а серия
+        # обновлений в пределах окна debounce сохраняется одной записью
+        self._lock: threading.RLock = threading.RLock()
+        self._dirty: bool = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_delay_seconds: float = (
+            self.settings.get("rates_flush_debounce_ms", 200) / 1000.0
+        )
+        # Предел задержки: непрерывный поток обновлений не откладывает запись
+        # дольше rates_flush_max_delay_ms от первого несохранённого изменения
+        self._flush_max_delay_seconds: float = (
+            self.settings.get("rates_flush_max_delay_ms", 2000) / 1000.0
+        )
+        self._dirty_since: Optional[float] = None  # time.monotonic()
+        # Проверка записанного файла повторным чтением (для тестов/отладки)
+        self._paranoid_write: bool = self.settings.get("cache_paranoid_write", False)
+        # fsync временного файла перед заменой: POSIX-гарантия сохранности при
+        # сбое питания ценой задержки записи (по умолчанию выключено)
+        self._fsync_on_write: bool = self.settings.get("cache_fsync", False)
+        # Фоновый поток записи: очередь хранит только последний снимок
+        # (сериализованный JSON и его номер); старые снимки вытесняются
+        self._pending: "queue.Queue[Tuple[int, bytes]]" = queue.Queue(maxsize=1)
+        self._writer_thread: Optional[threading.Thread] = None
+        self._write_lock: threading.Lock = threading.Lock()
+        self._snapshot_seq: int = 0  # Номер последнего снимка
+        self._written_seq: int = 0  # Номер последнего записанного снимка
+        # Несохранённые изменения записываются при завершении процесса
+        _LIVE_CACHES.add(self)
+
         self.logger.info(f"Кэш инициализирован: {self.filepath}")
 
+    def reload_settings(self) -> None:
+        """Перечитать настройки и пересчитать TTL кэша.
+
+        Raises:
+            ConfigError: При ошибках загрузки конфигурации
+        """
+        self.settings.reload()
+        self._resolve_ttl_settings()
+        self.logger.info("Настройки TTL кэша перечитаны")
+
+    def _resolve_ttl_settings(self) -> None:
+        """Построить таблицы TTL из текущих настроек.
+
+        Note:
+            Таблица по базовой валюте заменяет settings.get() на каждой
+            проверке свежести; кэш TTL по парам сбрасывается.
+        """
+        fiat_ttl = int(self.settings.get("rates_ttl_fiat_seconds", 3600))
+        crypto_ttl = int(self.settings.get("rates_ttl_crypto_seconds", 300))
+        self._ttl_by_base = {
+            **dict.fromkeys(self.FIAT_CURRENCIES, fiat_ttl),
+            **dict.fromkeys(self.CRYPTO_CURRENCIES, crypto_ttl),
+        }
+        # TTL для остальных валют
+        self._default_ttl = int(self.settings.get("rates_ttl_default_seconds", 1800))
+        # TTL, уже определённые для валютных пар
+        self._pair_ttl_cache = {}
+
     def get_rate(self, from_currency: str, to_currency: str) -> Optional[RateInfo]:
         """Получить информацию о курсе валюты из кэша.
 
@@ -106,12 +212,8 @@ class RatesCache:
             Выполняет проверку свежести данных через is_fresh().
             Возвращает структурированную информацию о курсе.
         """
-        # Нормализация кодов валют
-        from_norm: str = from_currency.upper().strip()
-        to_norm: str = to_currency.upper().strip()
-
-        # Формирование ключа валютной пары
-        pair_key: str = f"{from_norm}_{to_norm}"
+        # Нормализованный ключ валютной пары (мемоизирован для частых пар)
+        pair_key: str = _normalize_pair(from_currency, to_currency)
 
         # Логирование запроса курса
         self.logger.debug(f"Запрос курса для пары: {pair_key}")
@@ -175,7 +277,7 @@ class RatesCache:
 
         Note:
             Сравнивает timestamp с текущими данными и обновляет только если свежее.
-            Выполняет атомарную запись обновленных данных в файл.
+            Запись в файл откладывается (см. flush()).
         """
         # Валидация входных параметров
         if not pair or "_" not in pair:
@@ -188,81 +290,39 @@ class RatesCache:
             raise ValueError("Источник данных не может быть пустым")
 
         # Использование текущего времени если timestamp не указан
-        update_time: str = timestamp or datetime.now().isoformat() + "Z"
+        now_iso: str = _utc_now_iso()
+        update_time: str = timestamp or now_iso
 
         # Логирование операции обновления
         self.logger.debug(
             f"Обновление курса для {pair}: {rate} от {source} " f"в {update_time}"
         )
 
-        # 1. Загрузка данных кэша если они еще не загружены
-        if self._cache_data is None:
-            self._load_cache()
+        with self._lock:
+            # 1. Загрузка данных кэша если они еще не загружены
+            if self._cache_data is None:
+                self._load_cache()
 
-        # Убедимся что данные кэша загружены
-        if self._cache_data is None:
-            raise CacheError(
-                "Не удалось загрузить данные кэша", operation="update_rate"
-            )
-
-        # 2. Получение текущих данных пары (если есть)
-        pairs_data: Dict[str, Any] = self._cache_data.get("pairs", {})
-        current_pair_data: Optional[Dict[str, Any]] = pairs_data.get(pair)
-
-        # 3. Проверка нужно ли обновлять данные
-        should_update: bool = True  # По умолчанию обновляем
-
-        if current_pair_data is not None:
-            # Есть текущие данные - проверяем свежесть
-            current_time_str: str = current_pair_data.get("updated_at", "")
-
-            try:
-                # Парсинг времени для сравнения
-                current_time: datetime = datetime.fromisoformat(
-                    current_time_str.replace("Z", "+00:00")
-                )
-                new_time: datetime = datetime.fromisoformat(
-                    update_time.replace("Z", "+00:00")
-                )
-
-                # Обновляем только если новые данные свежее
-                should_update = new_time > current_time
-
-                if not should_update:
-                    self.logger.debug(
-                        f"Данные для {pair} не обновлены: "
-                        f"новые данные устарели ({new_time} <= {current_time})"
-                    )
-
-            except (ValueError, TypeError):
-                # Некорректный формат времени - обновляем в любом случае
-                self.logger.warning(
-                    f"Некорректный формат времени для пары {pair}, "
-                    f"обновление выполняется"
+            # Убедимся что данные кэша загружены
+            if self._cache_data is None:
+                raise CacheError(
+                    "Не удалось загрузить данные кэша", operation="update_rate"
                 )
-                should_update = True
-
-        # 4. Обновление данных если нужно
-        if should_update:
-            # Создание новых данных пары
-            new_pair_data: Dict[str, Any] = {
-                "rate": float(rate),
-                "updated_at": update_time,
-                "source": source.strip(),
-            }
 
-            # Обновление данных в кэше
-            pairs_data[pair] = new_pair_data
-            self._cache_data["pairs"] = pairs_data
-            self._cache_data["last_refresh"] = datetime.now().isoformat() + "Z"
+            # 2. Обновление пары в памяти если данные свежее текущих
+            pairs_data: Dict[str, Any] = self._cache_data.setdefault("pairs", {})
+            if not self._apply_update(
+                pairs_data, pair, float(rate), source, update_time
+            ):
+                return False  # Данные не обновлены (устарели)
 
-            # 5. Атомарная запись обновленных данных в файл
-            self._atomic_write(self._cache_data)
+            self._cache_data["last_refresh"] = now_iso
 
-            self.logger.info(f"Курс обновлен: {pair} = {rate} от {source}")
-            return True  # Данные обновлены
+            # 3. Отложенная атомарная запись обновленных данных в файл
+            self._mark_dirty()
 
-        return False  # Данные не обновлены (устарели)
+        self.logger.info(f"Курс обновлен: {pair} = {rate} от {source}")
+        return True  # Данные обновлены
 
     def bulk_update(self, rates: Dict[str, Dict[str, Any]]) -> int:
         """Массовое обновление курсов в кэше.
@@ -279,7 +339,7 @@ class RatesCache:
 
         Note:
             Обновляет только те курсы, которые свежее текущих.
-            Выполняет атомарное сохранение всех изменений.
+            Все изменения сохраняются одной отложенной записью (см. flush()).
         """
         # Логирование начала массового обновления
         self.logger.info(f"Массовое обновление {len(rates)} курсов")
@@ -289,212 +349,514 @@ class RatesCache:
             self.logger.warning("Попытка массового обновления пустым словарем")
             return 0
 
-        # 1. Загрузка данных кэша если они еще не загружены
-        if self._cache_data is None:
-            self._load_cache()
+        # Одно значение текущего времени на всю операцию
+        now_iso: str = _utc_now_iso()
 
-        # Убедимся что данные кэша загружены
-        if self._cache_data is None:
-            raise CacheError(
-                "Не удалось загрузить данные кэша", operation="bulk_update"
-            )
+        with self._lock:
+            # 1. Загрузка данных кэша если они еще не загружены
+            if self._cache_data is None:
+                self._load_cache()
 
-        pairs_data: Dict[str, Any] = self._cache_data.get("pairs", {})
-        updated_count: int = 0  # Счетчик обновленных курсов
+            # Убедимся что данные кэша загружены
+            if self._cache_data is None:
+                raise CacheError(
+                    "Не удалось загрузить данные кэша", operation="bulk_update"
+                )
 
-        # 2. Обработка каждого курса для обновления
-        for pair, new_data in rates.items():
-            try:
-                # Валидация формата пары
-                if "_" not in pair:
-                    self.logger.warning(f"Некорректный формат пары: {pair}")
-                    continue
+            pairs_data: Dict[str, Any] = self._cache_data.setdefault("pairs", {})
+            updated_count: int = 0  # Счетчик обновленных курсов
 
-                # Извлечение данных из словаря
-                rate: Any = new_data.get("rate")
-                source: Optional[str] = new_data.get("source")
-                timestamp: Optional[str] = new_data.get("updated_at")
+            # 2. Обработка каждого курса для обновления
+            for pair, new_data in rates.items():
+                try:
+                    # Валидация формата пары
+                    if "_" not in pair:
+                        self.logger.warning(f"Некорректный формат пары: {pair}")
+                        continue
 
-                # Валидация обязательных полей
-                if rate is None or source is None:
-                    self.logger.warning(
-                        f"Отсутствуют обязательные поля для пары {pair}"
-                    )
-                    continue
+                    # Извлечение данных из словаря
+                    rate: Any = new_data.get("rate")
+                    source: Optional[str] = new_data.get("source")
+                    timestamp: Optional[str] = new_data.get("updated_at")
 
-                # Преобразование rate в float
-                try:
-                    rate_float: float = float(rate)
-                    if rate_float <= 0:
+                    # Валидация обязательных полей
+                    if rate is None or source is None:
                         self.logger.warning(
-                            f"Неположительный курс для пары {pair}: {rate_float}"
+                            f"Отсутствуют обязательные поля для пары {pair}"
                         )
                         continue
-                except (ValueError, TypeError):
-                    self.logger.warning(
-                        f"Некорректный тип курса для пары {pair}: {rate}"
+
+                    # Преобразование rate в float
+                    try:
+                        rate_float: float = float(rate)
+                        if rate_float <= 0:
+                            self.logger.warning(
+                                f"Неположительный курс для пары {pair}: {rate_float}"
+                            )
+                            continue
+                    except (ValueError, TypeError):
+                        self.logger.warning(
+                            f"Некорректный тип курса для пары {pair}: {rate}"
+                        )
+                        continue
+
+                    # Использование общего времени операции если timestamp
+                    # не указан
+                    update_time: str = timestamp or now_iso
+
+                    # 3. Обновление в памяти если данные свежее текущих
+                    if self._apply_update(
+                        pairs_data, pair, rate_float, source, update_time
+                    ):
+                        updated_count += 1
+
+                except Exception as e:
+                    # Ошибка обработки конкретной пары - логируем и продолжаем
+                    self.logger.error(
+                        f"Ошибка обработки пары {pair}: {e}", exc_info=False
                     )
                     continue
 
-                # Использование текущего времени если timestamp не указан
-                update_time: str = timestamp or datetime.now().isoformat() + "Z"
+            # 4. Сохранение обновлений если есть что сохранять
+            if updated_count > 0:
+                self._cache_data["last_refresh"] = now_iso
 
-                # 3. Проверка нужно ли обновлять данные
-                should_update: bool = True
-                current_pair_data: Optional[Dict[str, Any]] = pairs_data.get(pair)
+                # Отложенная атомарная запись обновленных данных
+                self._mark_dirty()
 
-                if current_pair_data is not None:
-                    # Есть текущие данные - проверяем свежесть
-                    current_time_str: str = current_pair_data.get("updated_at", "")
+                self.logger.info(
+                    f"Массовое обновление завершено: {updated_count} курсов "
+                    f"обновлено, всего пар в кэше: {len(pairs_data)}"
+                )
+            else:
+                self.logger.info("Массовое обновление: нет новых данных для обновления")
 
-                    try:
-                        # Парсинг времени для сравнения
-                        current_time: datetime = datetime.fromisoformat(
-                            current_time_str.replace("Z", "+00:00")
-                        )
-                        new_time: datetime = datetime.fromisoformat(
-                            update_time.replace("Z", "+00:00")
-                        )
+        return updated_count  # Возврат количества обновленных курсов
 
-                        # Обновляем только если новые данные свежее
-                        should_update = new_time > current_time
+    def _apply_update(
+        self,
+        pairs_data: Dict[str, Any],
+        pair: str,
+        rate: float,
+        source: str,
+        update_time: str,
+    ) -> bool:
+        """Обновить данные пары в памяти если новые данные свежее текущих.
 
-                    except (ValueError, TypeError):
-                        # Некорректный формат времени - обновляем
-                        should_update = True
-
-                # 4. Обновление данных если нужно
-                if should_update:
-                    # Создание новых данных пары
-                    new_pair_data: Dict[str, Any] = {
-                        "rate": rate_float,
-                        "updated_at": update_time,
-                        "source": source.strip(),
-                    }
-
-                    # Обновление в памяти
-                    pairs_data[pair] = new_pair_data
-                    updated_count += 1
-
-                    self.logger.debug(f"Подготовлено обновление для пары: {pair}")
-
-            except Exception as e:
-                # Ошибка обработки конкретной пары - логируем и продолжаем
-                self.logger.error(f"Ошибка обработки пары {pair}: {e}", exc_info=False)
-                continue
+        Args:
+            pairs_data: Словарь пар кэша (изменяется на месте)
+            pair: Валютная пара (например, "BTC_USD")
+            rate: Проверенное значение курса
+            source: Источник данных
+            update_time: Время обновления в ISO формате
+
+        Returns:
+            True если данные пары обновлены, False если новые данные устарели
+
+        Note:
+            Вызывается под self._lock; в файл ничего не записывает.
+        """
+        current_pair_data: Optional[Dict[str, Any]] = pairs_data.get(pair)
+        # Источников единицы - одна интернированная строка на все пары
+        source = sys.intern(source.strip())
 
-        # 5. Сохранение обновлений если есть что сохранять
-        if updated_count > 0:
-            # Обновление структуры данных кэша
-            self._cache_data["pairs"] = pairs_data
-            self._cache_data["last_refresh"] = datetime.now().isoformat() + "Z"
+        if current_pair_data is not None:
+            # Есть текущие данные - проверяем свежесть
+            current_time_str: str = current_pair_data.get("updated_at", "")
 
-            # Атомарная запись обновленных данных
-            self._atomic_write(self._cache_data)
+            try:
+                # Обновляем только если новые данные свежее
+                if not _is_newer_timestamp(update_time, current_time_str):
+                    self.logger.debug(
+                        f"Данные для {pair} не обновлены: новые данные "
+                        f"устарели ({update_time} <= {current_time_str})"
+                    )
+                    return False
 
-            self.logger.info(
-                f"Массовое обновление завершено: {updated_count} курсов обновлено, "
-                f"всего пар в кэше: {len(pairs_data)}"
-            )
+            except (ValueError, TypeError):
+                # Некорректный формат времени - обновляем в любом случае
+                self.logger.warning(
+                    f"Некорректный формат времени для пары {pair}, "
+                    f"обновление выполняется"
+                )
+
+        if current_pair_data is not None:
+            # Обновление существующего словаря пары на месте (без аллокации)
+            current_pair_data["rate"] = rate
+            current_pair_data["updated_at"] = update_time
+            current_pair_data["source"] = source
         else:
-            self.logger.info("Массовое обновление: нет новых данных для обновления")
+            # Создание данных новой пары
+            pairs_data[pair] = {
+                "rate": rate,
+                "updated_at": update_time,
+                "source": source,
+            }
+        self._remember_epoch(pair, update_time)
+        self.logger.debug(f"Подготовлено обновление для пары: {pair}")
+        return True
 
-        return updated_count  # Возврат количества обновленных курсов
+    def _remember_epoch(self, pair: str, timestamp: str) -> None:
+        """Сохранить epoch времени обновления пары для проверок свежести.
 
-    def get_all_rates(self) -> Dict[str, Dict[str, Any]]:
-        """Получить все актуальные курсы из кэша.
+        Args:
+            pair: Валютная пара (например, "BTC_USD")
+            timestamp: Время обновления в ISO формате
+        """
+        epoch: Optional[float] = _timestamp_to_epoch(timestamp)
+        if epoch is None:
+            self._updated_epochs.pop(pair, None)
+        else:
+            self._updated_epochs[pair] = (timestamp, epoch)
+
+    def _mark_dirty(self) -> None:
+        """Пометить кэш изменённым и запланировать отложенную запись.
+
+        Note:
+            Каждый вызов перезапускает таймер, поэтому серия обновлений
+            сохраняется одной записью через rates_flush_debounce_ms после
+            последнего изменения, но не позже rates_flush_max_delay_ms после
+            первого несохранённого. При нулевой задержке запись выполняется
+            сразу.
+        """
+        with self._lock:
+            self._dirty = True
+            now: float = time.monotonic()
+            if self._dirty_since is None:
+                self._dirty_since = now
+
+            if self._flush_delay_seconds <= 0:
+                self.flush()
+                return
+
+            # Задержка ограничена остатком предельного окна
+            delay: float = min(
+                self._flush_delay_seconds,
+                self._dirty_since + self._flush_max_delay_seconds - now,
+            )
+            if delay <= 0:
+                # Предел исчерпан - снимок сразу уходит потоку записи
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                self._flush_from_timer()
+                return
+
+            # Перезапуск таймера отложенной записи
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(delay, self._flush_from_timer)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush_from_timer(self) -> None:
+        """Передать снимок изменений фоновому потоку записи (из таймера).
+
+        Note:
+            Снимок сериализуется под блокировкой, а запись файла выполняется
+            в потоке записи - обновления кэша не ждут завершения I/O.
+        """
+        with self._lock:
+            self._flush_timer = None
+            try:
+                snapshot = self._take_snapshot()
+            except CacheError as e:
+                # В потоке таймера исключение некому обработать
+                self.logger.error(f"Отложенная запись кэша не выполнена: {e}")
+                return
+            if snapshot is None:
+                return
+
+            # Последний снимок вытесняет ещё не записанный предыдущий
+            while True:
+                try:
+                    self._pending.put_nowait(snapshot)
+                    break
+                except queue.Full:
+                    try:
+                        self._pending.get_nowait()
+                    except queue.Empty:
+                        pass
+                    else:
+                        self._pending.task_done()
+
+            # Ленивый запуск потока записи
+            if self._writer_thread is None or not self._writer_thread.is_alive():
+                self._writer_thread = threading.Thread(
+                    target=self._writer_loop, name="rates-cache-writer", daemon=True
+                )
+                self._writer_thread.start()
+
+    def _writer_loop(self) -> None:
+        """Цикл фонового потока: записывать снимки кэша из очереди."""
+        while True:
+            seq, payload = self._pending.get()
+            try:
+                self._write_snapshot(seq, payload)
+            except CacheError as e:
+                # В фоновом потоке исключение некому обработать: изменения
+                # остаются несохранёнными до следующей записи
+                self.logger.error(f"Отложенная запись кэша не выполнена: {e}")
+                with self._lock:
+                    self._dirty = True
+            finally:
+                # Снимок обработан - flush() может перестать ждать
+                self._pending.task_done()
+
+    def _take_snapshot(self) -> Optional[Tuple[int, bytes]]:
+        """Сериализовать несохранённые изменения в нумерованный снимок.
 
         Returns:
-            Словарь со всеми курсами в формате {pair: {rate, updated_at, source}}
+            (номер снимка, JSON) или None если изменений нет
 
         Raises:
-            CacheError: При ошибках загрузки данных кэша
+            CacheError: При ошибке сериализации данных кэша
 
         Note:
-            Возвращает копию данных для защиты от модификации.
-            Данные уже загружены и проверены.
+            Вызывается под self._lock; сбрасывает флаг изменений.
         """
-        # 1. Загрузка данных кэша если они еще не загружены
+        if not self._dirty or self._cache_data is None:
+            return None
+
+        # Проверка структуры в памяти вместо повторного разбора файла
+        self._check_structure_before_write(self._cache_data, "_take_snapshot")
+
+        try:
+            # Компактная сериализация JSON (orjson если установлен); данные
+            # кэша состоят только из примитивов, проверенных при обновлении
+            payload: bytes = json_codec.dumps(self._cache_data)
+        except (TypeError, ValueError) as e:
+            raise CacheError(
+                f"Ошибка сериализации кэша: {e}", operation="_take_snapshot"
+            ) from e
+
+        self._snapshot_seq += 1
+        self._dirty = False
+        self._dirty_since = None
+        return self._snapshot_seq, payload
+
+    def _write_snapshot(self, seq: int, payload: bytes) -> None:
+        """Записать снимок в файл, если он новее уже записанного.
+
+        Args:
+            seq: Номер снимка
+            payload: Сериализованные данные кэша
+
+        Raises:
+            CacheError: При ошибках атомарной записи файла кэша
+        """
+        with self._write_lock:
+            # Более новый снимок уже записан (например, через flush())
+            if seq <= self._written_seq:
+                return
+            self._atomic_write_bytes(payload)
+            self._written_seq = seq
+
+    def flush(self) -> None:
+        """Немедленно записать несохранённые изменения кэша в файл.
+
+        Raises:
+            CacheError: При ошибках атомарной записи файла кэша
+
+        Note:
+            Отменяет запланированную отложенную запись и дописывает снимок,
+            ещё ожидающий фонового потока. Если фоновый поток уже пишет
+            снимок, дожидается окончания записи: после возврата данные
+            находятся на диске.
+        """
+        from_queue: bool = False
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+
+            snapshot = self._take_snapshot()
+            if snapshot is None:
+                # Изменений нет - запись ожидающего в очереди снимка
+                try:
+                    snapshot = self._pending.get_nowait()
+                    from_queue = True
+                except queue.Empty:
+                    pass
+
+        if snapshot is None:
+            # Ожидание снимка, уже взятого фоновым потоком (вне self._lock:
+            # поток записи захватывает его при ошибке)
+            self._pending.join()
+            return
+
+        try:
+            self._write_snapshot(*snapshot)
+        except CacheError:
+            with self._lock:
+                self._dirty = True
+            raise
+        finally:
+            if from_queue:
+                self._pending.task_done()
+
+    def _pairs_view(self, operation: str) -> Dict[str, Dict[str, Any]]:
+        """Получить живой словарь пар кэша без копирования (для чтения).
+
+        Args:
+            operation: Название вызывающей операции для CacheError
+
+        Returns:
+            Словарь пар из данных кэша в памяти (не изменять снаружи)
+
+        Raises:
+            CacheError: При ошибках загрузки данных кэша
+        """
+        # Загрузка данных кэша если они еще не загружены
         if self._cache_data is None:
             self._load_cache()
 
         # Убедимся что данные кэша загружены
         if self._cache_data is None:
-            raise CacheError(
-                "Не удалось загрузить данные кэша", operation="get_all_rates"
-            )
+            raise CacheError("Не удалось загрузить данные кэша", operation=operation)
+
+        return self._cache_data.get("pairs", {})
 
-        # 2. Возврат копии данных пар (защита от модификации)
-        pairs_data: Dict[str, Dict[str, Any]] = self._cache_data.get("pairs", {}).copy()
+    def _scan_pairs(self) -> Tuple[int, int, int, List[str]]:
+        """Классифицировать пары по типу валюты и найти устаревшие за один проход.
+
+        Returns:
+            Кортеж (фиатных пар, крипто пар, прочих пар, список устаревших пар)
+
+        Raises:
+            CacheError: При ошибках загрузки данных кэша
+        """
+        pairs_data: Dict[str, Dict[str, Any]] = self._pairs_view("_scan_pairs")
+
+        fiat_pairs: int = 0
+        crypto_pairs: int = 0
+        other_pairs: int = 0
+        stale_pairs: List[str] = []
+        now: float = time.time()  # Одно значение времени на весь проход
+
+        # Локальные ссылки для плотного цикла без поиска атрибутов
+        fiat_set = self.FIAT_CURRENCIES
+        crypto_set = self.CRYPTO_CURRENCIES
+        cached_epoch = self._updated_epochs.get
+        cached_ttl = self._pair_ttl_cache.get
+        is_fresh = self.is_fresh
+
+        for pair, pair_data in pairs_data.items():
+            # Подсчет пар по типу базовой валюты
+            base_currency: str = pair.partition("_")[0].upper()
+            if base_currency in fiat_set:
+                fiat_pairs += 1
+            elif base_currency in crypto_set:
+                crypto_pairs += 1
+            else:
+                other_pairs += 1
+
+            # Быстрый путь: epoch и TTL пары уже известны - только вычитание
+            timestamp: str = pair_data.get("updated_at", "")
+            epoch_entry = cached_epoch(pair)
+            ttl_seconds: Optional[int] = cached_ttl(pair)
+            if (
+                epoch_entry is not None
+                and ttl_seconds is not None
+                and epoch_entry[0] == timestamp
+            ):
+                if now - epoch_entry[1] > ttl_seconds:
+                    stale_pairs.append(pair)
+            # Общий путь (первая проверка пары, нестандартное время)
+            elif not is_fresh(pair, timestamp, now):
+                stale_pairs.append(pair)
+
+        return fiat_pairs, crypto_pairs, other_pairs, stale_pairs
+
+    def get_all_rates(self) -> Mapping[str, Dict[str, Any]]:
+        """Получить все актуальные курсы из кэша.
+
+        Returns:
+            Read-only представление курсов {pair: {rate, updated_at, source}}
+
+        Raises:
+            CacheError: При ошибках загрузки данных кэша
+
+        Note:
+            Возвращает MappingProxyType над данными кэша без копирования:
+            изменить кэш через него нельзя, а последующие обновления видны.
+            Данные уже загружены и проверены.
+        """
+        pairs_data: Dict[str, Dict[str, Any]] = self._pairs_view("get_all_rates")
 
         # Логирование операции
         self.logger.debug(f"Получено {len(pairs_data)} курсов из кэша")
 
-        return pairs_data  # Возврат копии данных
+        return MappingProxyType(pairs_data)  # Read-only представление
 
-    def is_fresh(self, currency_pair: str, timestamp: str) -> bool:
+    def is_fresh(
+        self, currency_pair: str, timestamp: str, now: Optional[float] = None
+    ) -> bool:
         """Проверить свежесть курса по TTL из настроек.
 
         Args:
             currency_pair: Валютная пара (например, "BTC_USD")
             timestamp: Время обновления в ISO формате
+            now: Текущее время time.time() (для проверки серии пар одним
+                значением; по умолчанию берётся текущее)
 
         Returns:
             True если курс свежий, False если устарел
 
         Note:
-            Использует TTL настройки из SettingsLoader для разных типов валют.
+            TTL для разных типов валют берётся из таблицы, построенной по
+            настройкам SettingsLoader при создании кэша.
             Возвращает False при некорректном формате timestamp.
+            Для пар кэша используется epoch, вычисленный при загрузке или
+            обновлении, без повторного разбора строки времени.
         """
         # Проверка на пустой timestamp
         if not timestamp or timestamp == "N/A":
             self.logger.debug(f"Пустой timestamp для пары {currency_pair}")
             return False
 
-        try:
-            # Парсинг timestamp из строки ISO формата
-            update_time: datetime = datetime.fromisoformat(
-                timestamp.replace("Z", "+00:00")
-            )
-        except (ValueError, TypeError):
+        # Предвычисленный epoch пары, если timestamp совпадает с данными кэша
+        cached = self._updated_epochs.get(currency_pair)
+        if cached is not None and cached[0] == timestamp:
+            update_epoch: Optional[float] = cached[1]
+        else:
+            update_epoch = _timestamp_to_epoch(timestamp)
+
+        if update_epoch is None:
             # Некорректный формат timestamp
             self.logger.warning(
                 f"Некорректный формат timestamp для пары {currency_pair}"
             )
             return False
 
-        # Определение типа валюты для выбора TTL
-        try:
-            base_currency: str = currency_pair.split("_")[0].upper()
-        except (IndexError, AttributeError):
-            # Некорректный формат валютной пары
-            self.logger.warning(f"Некорректный формат валютной пары: {currency_pair}")
-            return False
-
-        # Получение TTL из настроек в зависимости от типа валюты
-        if base_currency in self.FIAT_CURRENCIES:
-            # Фиатные валюты
-            ttl_seconds: int = self.settings.get("rates_ttl_fiat_seconds", 3600)
-        elif base_currency in self.CRYPTO_CURRENCIES:
-            # Криптовалюты
-            ttl_seconds = self.settings.get("rates_ttl_crypto_seconds", 300)
-        else:
-            # Другие валюты (по умолчанию)
-            ttl_seconds = self.settings.get("rates_ttl_default_seconds", 1800)
+        # TTL пары: из кэша по паре или по типу базовой валюты
+        ttl_seconds: Optional[int] = self._pair_ttl_cache.get(currency_pair)
+        if ttl_seconds is None:
+            try:
+                base_currency: str = currency_pair.partition("_")[0].upper()
+            except AttributeError:
+                # Некорректный формат валютной пары
+                self.logger.warning(
+                    f"Некорректный формат валютной пары: {currency_pair}"
+                )
+                return False
+            ttl_seconds = self._ttl_by_base.get(base_currency, self._default_ttl)
+            self._pair_ttl_cache[currency_pair] = ttl_seconds
 
         # Расчет времени, прошедшего с обновления
-        current_time: datetime = datetime.now()
-        time_since_update: float = (current_time - update_time).total_seconds()
+        if now is None:
+            now = time.time()
+        time_since_update: float = now - update_epoch
 
         # Проверка свежести (прошло ли меньше времени чем TTL)
         is_fresh_result: bool = time_since_update <= ttl_seconds
 
         # Логирование результата проверки свежести
-        freshness_status: str = "свежий" if is_fresh_result else "устаревший"
-        self.logger.debug(
-            f"Проверка свежести {currency_pair}: {freshness_status} "
-            f"(прошло {time_since_update:.0f} сек, TTL: {ttl_seconds} сек)"
-        )
+        if self.logger.isEnabledFor(logging.DEBUG):
+            freshness_status: str = "свежий" if is_fresh_result else "устаревший"
+            self.logger.debug(
+                f"Проверка свежести {currency_pair}: {freshness_status} "
+                f"(прошло {time_since_update:.0f} сек, TTL: {ttl_seconds} сек)"
+            )
 
         return is_fresh_result  # Возврат результата проверки свежести
 
@@ -508,21 +870,11 @@ class RatesCache:
             CacheError: При ошибках загрузки данных кэша
 
         Note:
-            Использует метод is_fresh() для проверки каждой пары.
-            Возвращает только пары с устаревшими данными.
+            Использует метод is_fresh() для проверки каждой пары (через
+            _scan_pairs()). Возвращает только пары с устаревшими данными.
         """
-        # 1. Получение всех курсов из кэша
-        all_rates: Dict[str, Dict[str, Any]] = self.get_all_rates()
-
-        # 2. Проверка свежести для каждой пары
-        stale_pairs: List[str] = []
-
-        for pair, pair_data in all_rates.items():
-            timestamp: str = pair_data.get("updated_at", "")
-
-            # Проверка свежести данных пары
-            if not self.is_fresh(pair, timestamp):
-                stale_pairs.append(pair)
+        # Один проход по парам кэша без копирования словаря
+        stale_pairs: List[str] = self._scan_pairs()[3]
 
         # Логирование результатов
         self.logger.info(f"Найдено {len(stale_pairs)} пар с устаревшими данными")
@@ -538,46 +890,17 @@ class RatesCache:
         Raises:
             CacheError: При ошибках загрузки данных кэша
         """
-        # 1. Загрузка данных кэша если они еще не загружены
-        if self._cache_data is None:
-            self._load_cache()
-
-        # Убедимся что данные кэша загружены
-        if self._cache_data is None:
-            raise CacheError(
-                "Не удалось загрузить данные кэша", operation="get_cache_info"
-            )
-
-        # 2. Сбор информации о кэше
-        pairs_data: Dict[str, Any] = self._cache_data.get("pairs", {})
-        total_pairs: int = len(pairs_data)
-
-        # Подсчет пар по типам валют
-        fiat_pairs: int = 0
-        crypto_pairs: int = 0
-        other_pairs: int = 0
-
-        for pair in pairs_data.keys():
-            try:
-                base_currency: str = pair.split("_")[0].upper()
-                if base_currency in self.FIAT_CURRENCIES:
-                    fiat_pairs += 1
-                elif base_currency in self.CRYPTO_CURRENCIES:
-                    crypto_pairs += 1
-                else:
-                    other_pairs += 1
-            except (IndexError, AttributeError):
-                other_pairs += 1
-
-        # Получение устаревших пар
-        stale_pairs: List[str] = self.get_stale_pairs()
+        # 1. Классификация пар и поиск устаревших за один проход
+        fiat_pairs, crypto_pairs, other_pairs, stale_pairs = self._scan_pairs()
+        # _scan_pairs() гарантирует загрузку данных кэша
+        cache_data: Dict[str, Any] = self._cache_data or {}
 
-        # 3. Формирование информации о кэше
+        # 2. Формирование информации о кэше
         cache_info: Dict[str, Any] = {
             "filepath": str(self.filepath),
-            "version": self._cache_data.get("version", "unknown"),
-            "last_refresh": self._cache_data.get("last_refresh", "unknown"),
-            "total_pairs": total_pairs,
+            "version": cache_data.get("version", "unknown"),
+            "last_refresh": cache_data.get("last_refresh", "unknown"),
+            "total_pairs": fiat_pairs + crypto_pairs + other_pairs,
             "fiat_pairs": fiat_pairs,
             "crypto_pairs": crypto_pairs,
             "other_pairs": other_pairs,
@@ -608,20 +931,28 @@ class RatesCache:
             return
 
         try:
-            # Открытие файла для чтения в UTF-8 кодировке
-            with open(self.filepath, "r", encoding="utf-8") as f:
-                # Загрузка и парсинг JSON данных
-                file_data: Dict[str, Any] = json.load(f)
+            # Загрузка и парсинг JSON данных из отображения файла в память
+            file_data: Dict[str, Any] = self._read_cache_file()
 
-            # Валидация структуры загруженных данных
-            if not self._validate_cache_structure(file_data):
+            # Валидация структуры загруженных данных: проверка каждой пары
+            # только для файлов без актуального хэша схемы
+            check_pairs: bool = file_data.get("schema_hash") != self.SCHEMA_HASH
+            if not self._validate_cache_structure(file_data, check_pairs):
                 self.logger.warning(
                     "Некорректная структура файла кэша, создается новая"
                 )
                 self._cache_data = self._create_default_cache_structure()
             else:
                 # Данные валидны - сохранение в память
+                file_data["schema_hash"] = self.SCHEMA_HASH
                 self._cache_data = file_data
+                # Разбор времени обновления пар один раз при загрузке и
+                # интернирование повторяющихся названий источников
+                for pair, pair_data in file_data["pairs"].items():
+                    self._remember_epoch(pair, pair_data.get("updated_at", ""))
+                    source = pair_data.get("source")
+                    if type(source) is str:
+                        pair_data["source"] = sys.intern(source)
                 pairs_count: int = len(self._cache_data.get("pairs", {}))
                 self.logger.debug(f"Загружено {pairs_count} пар из файла кэша")
 
@@ -642,29 +973,69 @@ class RatesCache:
                 operation="_load_cache",
             )
 
-    def _validate_cache_structure(self, data: Dict[str, Any]) -> bool:
+    def _read_cache_file(self) -> Dict[str, Any]:
+        """Прочитать и распарсить файл кэша через mmap.
+
+        Returns:
+            Распарсенные данные файла кэша
+
+        Raises:
+            ValueError: При пустом файле или некорректном JSON
+            OSError: При ошибках открытия или отображения файла
+
+        Note:
+            Файл отображается в память только для чтения: orjson (если
+            установлен) разбирает его без промежуточной копии в bytes.
+        """
+        with open(self.filepath, "rb") as f:
+            # mmap не поддерживает файлы нулевой длины
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError("Файл кэша пустой")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # memoryview освобождается до закрытия mmap
+                with memoryview(mm) as view:
+                    return json_codec.loads(view)
+
+    def _validate_cache_structure(
+        self, data: Dict[str, Any], check_pairs: bool = True
+    ) -> bool:
         """Валидация структуры данных файла кэша.
 
         Args:
             data: Данные из файла для валидации
+            check_pairs: Проверять структуру каждой пары (False - только
+                верхний уровень, для файлов с актуальным хэшем схемы)
 
         Returns:
             True если структура валидна, False если нет
         """
+        # Проверка что данные являются словарем
+        if not isinstance(data, dict):
+            self.logger.warning("Данные кэша должны быть словарем")
+            return False
+
         # Проверка обязательных полей верхнего уровня
-        required_top_fields: List[str] = ["pairs", "last_refresh"]
-        for field in required_top_fields:
-            if field not in data:
-                self.logger.warning(f"Отсутствует поле верхнего уровня: {field}")
-                return False
+        if not data.keys() >= self._TOP_FIELDS_SET:
+            for field in self.REQUIRED_TOP_FIELDS:
+                if field not in data:
+                    self.logger.warning(f"Отсутствует поле верхнего уровня: {field}")
+                    return False
 
         # Проверка что pairs является словарем
         if not isinstance(data["pairs"], dict):
             self.logger.warning("Поле 'pairs' должно быть словарем")
             return False
 
-        # Проверка структуры каждой пары
+        if not check_pairs:
+            return True
+
+        # Проверка структуры каждой пары: быстрый путь для корректных пар,
+        # поиск конкретной ошибки только для некорректной
+        required_pair_fields: FrozenSet[str] = self._PAIR_FIELDS_SET
         for pair_key, pair_data in data["pairs"].items():
+            if type(pair_data) is dict and pair_data.keys() >= required_pair_fields:
+                continue
+
             if not isinstance(pair_data, dict):
                 self.logger.warning(
                     f"Некорректная структура данных для пары {pair_key}"
@@ -672,8 +1043,7 @@ class RatesCache:
                 return False
 
             # Проверка обязательных полей пары
-            pair_required_fields: List[str] = ["rate", "updated_at", "source"]
-            for field in pair_required_fields:
+            for field in self.PAIR_REQUIRED_FIELDS:
                 if field not in pair_data:
                     self.logger.warning(f"Отсутствует поле {field} для пары {pair_key}")
                     return False
@@ -687,10 +1057,11 @@ class RatesCache:
         Returns:
             Словарь со структурой данных кэша по умолчанию
         """
-        current_time: str = datetime.now().isoformat() + "Z"
+        current_time: str = _utc_now_iso()
 
         default_structure: Dict[str, Any] = {
             "version": self.CACHE_VERSION,
+            "schema_hash": self.SCHEMA_HASH,
             "last_refresh": current_time,
             "pairs": {},  # Пустой словарь пар
         }
@@ -708,117 +1079,278 @@ class RatesCache:
             CacheError: При ошибках записи, проверки целостности или переименования
 
         Note:
-            Использует паттерн временный файл → проверка → атомарное переименование
-            для гарантии целостности данных даже при сбоях системы.
+            Использует паттерн временный файл → атомарное переименование:
+            os.replace гарантирует, что файл кэша всегда содержит либо старую,
+            либо новую версию, поэтому backup-копия не нужна. Повторное чтение
+            временного файла для проверки выполняется только при включённой
+            настройке cache_paranoid_write. Настройка cache_fsync=True добавляет
+            fsync перед заменой (fsync директории не выполняется).
         """
-        # Создание путей к временному и основному файлам
+        # Проверка структуры в памяти вместо повторного разбора файла
+        self._check_structure_before_write(data, "_atomic_write")
+
+        try:
+            # Компактная сериализация JSON (orjson если установлен)
+            payload: bytes = json_codec.dumps(data)
+        except (TypeError, ValueError) as e:
+            raise CacheError(
+                f"Ошибка сериализации кэша: {e}", operation="_atomic_write"
+            ) from e
+
+        self._atomic_write_bytes(payload)
+
+    def _atomic_write_bytes(self, payload: bytes) -> None:
+        """Атомарно записать сериализованные данные кэша в файл.
+
+        Args:
+            payload: JSON данные кэша
+
+        Raises:
+            CacheError: При ошибках записи, проверки целостности или переименования
+
+        Note:
+            На Linux без paranoid-проверки данные пишутся в безымянный inode
+            (O_TMPFILE), который исчезает сам при падении процесса; иначе
+            используется именованный временный файл .tmp.
+        """
+        if not self._paranoid_write and self._write_via_tmpfile(payload):
+            return
+
+        # Создание пути к временному файлу
         temp_filepath: Path = self.filepath.with_suffix(".tmp")
-        backup_filepath: Path = self.filepath.with_suffix(".backup")
 
         try:
-            # 1. Создание backup существующего файла (если он существует)
-            if self.filepath.exists():
-                try:
-                    shutil.copy2(self.filepath, backup_filepath)
-                    self.logger.debug(f"Создан backup кэша: {backup_filepath}")
-                except Exception as backup_error:
-                    self.logger.warning(
-                        f"Не удалось создать backup кэша: {backup_error}"
-                    )
-                    # Продолжаем без backup
-
-            # 2. Запись данных во временный файл
-            with open(temp_filepath, "w", encoding="utf-8") as f:
-                # Сериализация JSON с форматированием
-                json.dump(
-                    data,
-                    f,
-                    indent=2,
-                    ensure_ascii=False,
-                    default=str,  # Преобразование несериализуемых типов в строки
-                )
+            # 1. Запись во временный файл напрямую через дескриптор (fsync по
+            # настройке и проверка размера - в _write_fd)
+            fd: int = os.open(
+                temp_filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644
+            )
+            try:
+                self._write_fd(fd, payload)
+            finally:
+                os.close(fd)
 
-            # 3. Проверка целостности записанных данных
-            self._verify_cache_file_integrity(temp_filepath)
+            # 2. Проверка целостности записанных данных (по настройке)
+            if self._paranoid_write:
+                self._verify_cache_file_integrity(temp_filepath, payload)
 
-            # 4. Атомарное переименование временного файла в основной
+            # 3. Атомарное переименование временного файла в основной
             temp_filepath.replace(self.filepath)
             self.logger.debug(f"Файл кэша обновлен атомарно: {self.filepath}")
 
-            # 5. Удаление временного файла (если он остался)
-            if temp_filepath.exists():
-                temp_filepath.unlink(missing_ok=True)
-
-            # 6. Удаление backup файла (если операция успешна)
-            if backup_filepath.exists():
-                backup_filepath.unlink(missing_ok=True)
-
         except Exception as e:
-            # 7. Восстановление из backup при ошибке
+            # Основной файл не тронут - достаточно удалить временный
             self.logger.error(f"Ошибка атомарной записи кэша: {e}")
+            temp_filepath.unlink(missing_ok=True)
 
-            if backup_filepath.exists() and self.filepath.exists():
+            # Проброс исключения дальше
+            raise CacheError(
+                f"Ошибка атомарной записи кэша: {e}", operation="_atomic_write"
+            ) from e
+
+    def _write_fd(self, fd: int, payload: bytes) -> None:
+        """Записать данные кэша в открытый дескриптор и проверить размер.
+
+        Args:
+            fd: Дескриптор временного файла, открытого на запись
+            payload: JSON данные кэша
+
+        Raises:
+            CacheError: Если размер файла не совпадает с размером данных
+            OSError: При ошибках записи
+
+        Note:
+            fsync только по настройке cache_fsync (курсы восстановимы
+            повторным запросом). Размер проверяется одним fstat на уже
+            открытом дескрипторе вместо повторного чтения файла.
+        """
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view) :]
+        if self._fsync_on_write:
+            os.fsync(fd)
+
+        written: int = os.fstat(fd).st_size
+        if written != len(payload):
+            raise CacheError(
+                f"Записано {written} байт вместо {len(payload)}",
+                operation="_atomic_write",
+            )
+
+    def _write_via_tmpfile(self, payload: bytes) -> bool:
+        """Записать кэш через безымянный временный inode (Linux O_TMPFILE).
+
+        Args:
+            payload: JSON данные кэша
+
+        Returns:
+            True если файл записан, False если O_TMPFILE недоступен
+            и нужно использовать запись через именованный .tmp файл
+
+        Raises:
+            CacheError: При ошибках записи или переименования
+        """
+        global _TMPFILE_SUPPORTED
+
+        if not _TMPFILE_SUPPORTED:
+            return False
+
+        try:
+            # Безымянный файл в каталоге кэша (та же ФС, что и у rates.json)
+            fd: int = os.open(self.filepath.parent, os.O_TMPFILE | os.O_WRONLY, 0o644)
+        except OSError as e:
+            if e.errno in _TMPFILE_UNSUPPORTED_ERRNOS:
+                # ФС или ядро не поддерживают O_TMPFILE - больше не пытаемся
+                _TMPFILE_SUPPORTED = False
+            self.logger.debug("O_TMPFILE не открыт, используется .tmp: %s", e)
+            return False
+
+        new_filepath: Path = self.filepath.with_name(self.filepath.name + ".new")
+        linked: bool = False
+        try:
+            try:
+                self._write_fd(fd, payload)
+
+                # linkat: даем inode имя только после полной записи
                 try:
-                    backup_filepath.replace(self.filepath)
-                    self.logger.info("Кэш восстановлен из backup")
-                except Exception as restore_error:
-                    raise CacheError(
-                        f"Ошибка записи и восстановления кэша: {e}, "
-                        f"восстановление не удалось: {restore_error}",
-                        operation="_atomic_write",
-                    ) from restore_error
-            elif backup_filepath.exists():
-                # Если основного файла не было, просто удаляем backup
-                backup_filepath.unlink(missing_ok=True)
-
-            # Удаление временного файла если он существует
-            if temp_filepath.exists():
-                temp_filepath.unlink(missing_ok=True)
+                    self._link_tmpfile(fd, new_filepath)
+                except OSError as e:
+                    if e.errno in _TMPFILE_UNSUPPORTED_ERRNOS:
+                        # Песочницы и часть ФС запрещают linkat через /proc
+                        # (EXDEV/EPERM) - больше не пытаемся
+                        _TMPFILE_SUPPORTED = False
+                    # Безымянный inode просто исчезнет; эта запись - через .tmp
+                    self.logger.debug("linkat не выполнен, используется .tmp: %s", e)
+                    return False
+                linked = True
+            finally:
+                os.close(fd)
+
+            # Атомарная замена основного файла
+            new_filepath.replace(self.filepath)
+            self.logger.debug("Файл кэша обновлен атомарно: %s", self.filepath)
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Ошибка атомарной записи кэша: {e}")
+            if linked:
+                new_filepath.unlink(missing_ok=True)
 
-            # Проброс исключения дальше
             raise CacheError(
                 f"Ошибка атомарной записи кэша: {e}", operation="_atomic_write"
             ) from e
 
-    def _verify_cache_file_integrity(self, filepath: Path) -> None:
+    @staticmethod
+    def _link_tmpfile(fd: int, new_filepath: Path) -> None:
+        """Дать имя безымянному inode через linkat (/proc/self/fd).
+
+        Args:
+            fd: Дескриптор файла, открытого с O_TMPFILE
+            new_filepath: Имя для inode (rates.json.new)
+
+        Raises:
+            OSError: Если linkat не выполнен
+
+        Note:
+            Если .new создан другим экземпляром кэша между удалением и
+            linkat (EEXIST), попытка повторяется один раз.
+        """
+        for attempt in range(2):
+            new_filepath.unlink(missing_ok=True)
+            try:
+                os.link(f"/proc/self/fd/{fd}", new_filepath, follow_symlinks=True)
+                return
+            except FileExistsError:
+                if attempt:
+                    raise
+
+    def _check_structure_before_write(
+        self, data: Dict[str, Any], operation: str
+    ) -> None:
+        """Проверить структуру данных кэша в памяти перед сериализацией.
+
+        Args:
+            data: Данные кэша для записи
+            operation: Название операции для сообщения об ошибке
+
+        Raises:
+            CacheError: Если структура некорректна (только при включённой
+                настройке cache_paranoid_write)
+        """
+        if self._paranoid_write and not self._validate_cache_structure(
+            data, check_pairs=False
+        ):
+            raise CacheError(
+                "Некорректная структура данных кэша перед записью",
+                operation=operation,
+            )
+
+    def _verify_cache_file_integrity(
+        self, filepath: Path, payload: bytes, deep: bool = False
+    ) -> None:
         """Проверка целостности записанного файла кэша.
 
         Args:
             filepath: Путь к файлу для проверки
+            payload: Сериализованные данные, которые должны быть в файле
+            deep: Дополнительно распарсить файл и проверить структуру каждой
+                пары (для отладки)
 
         Raises:
             CacheError: Если файл поврежден или имеет некорректную структуру
 
         Note:
-            Проверяет что файл существует, содержит валидный JSON
-            и имеет правильную структуру данных кэша.
+            Структура уже проверена в памяти до сериализации, поэтому файл
+            сверяется с буфером по размеру и CRC32 без разбора JSON.
         """
-        # Проверка что файл существует и не пустой
+        # Проверка что файл существует и совпадает по размеру с буфером
         if not filepath.exists():
             raise CacheError(
                 "Временный файл кэша не создан",
                 operation="_verify_cache_file_integrity",
             )
 
-        if filepath.stat().st_size == 0:
+        file_size: int = filepath.stat().st_size
+        if file_size == 0:
+            # mmap не поддерживает файлы нулевой длины
             raise CacheError(
                 "Временный файл кэша пустой", operation="_verify_cache_file_integrity"
             )
+        if file_size != len(payload):
+            raise CacheError(
+                "Размер временного файла кэша не совпадает с записанными данными",
+                operation="_verify_cache_file_integrity",
+            )
 
         try:
-            # Попытка загрузить и проверить JSON
-            with open(filepath, "r", encoding="utf-8") as f:
-                test_data: Dict[str, Any] = json.load(f)
+            # Только что записанные страницы читаются из page cache через
+            # mmap без копирования в bytes
+            with (
+                open(filepath, "rb") as f,
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+            ):
+                # Сверка контрольной суммы записанных байтов с исходным буфером
+                if zlib.crc32(mm) != zlib.crc32(payload):
+                    raise CacheError(
+                        "Контрольная сумма временного файла кэша не совпадает",
+                        operation="_verify_cache_file_integrity",
+                    )
 
-            # Проверка структуры загруженных данных
-            if not self._validate_cache_structure(test_data):
-                raise CacheError(
-                    "Некорректная структура данных во временном файле кэша",
-                    operation="_verify_cache_file_integrity",
-                )
+                # Полный разбор и проверка всех пар только по запросу;
+                # memoryview освобождается до закрытия mmap
+                if deep:
+                    with memoryview(mm) as view:
+                        test_data: Dict[str, Any] = json_codec.loads(view)
+                    if not self._validate_cache_structure(test_data):
+                        raise CacheError(
+                            "Некорректная структура данных во временном файле кэша",
+                            operation="_verify_cache_file_integrity",
+                        )
 
-        except json.JSONDecodeError as e:
-            # Ошибка парсинга JSON
+        except CacheError:
+            raise
+        except ValueError as e:
+            # Ошибка парсинга JSON (json и orjson JSONDecodeError)
             raise CacheError(
                 f"Некорректный JSON во временном файле кэша: {e}",
                 operation="_verify_cache_file_integrity",
@@ -831,6 +1363,96 @@ class RatesCache:
             ) from e
 
 
+@functools.lru_cache(maxsize=1024)
+def _normalize_pair(from_currency: str, to_currency: str) -> str:
+    """Сформировать нормализованный ключ валютной пары.
+
+    Args:
+        from_currency: Исходная валюта (например, " btc")
+        to_currency: Целевая валюта (например, "usd")
+
+    Returns:
+        Интернированный ключ пары (например, "BTC_USD")
+    """
+    return sys.intern(f"{from_currency.upper().strip()}_{to_currency.upper().strip()}")
+
+
+def _utc_now_iso() -> str:
+    """Текущее время UTC в ISO формате с суффиксом "Z".
+
+    Returns:
+        Строка вида "2025-10-10T12:00:00.123456Z"
+    """
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _timestamp_to_epoch(timestamp: str) -> Optional[float]:
+    """Преобразовать время обновления в ISO формате в epoch (time.time()).
+
+    Args:
+        timestamp: Время в ISO формате, например "2025-10-10T12:00:00Z"
+
+    Returns:
+        Секунды epoch или None при некорректном формате
+
+    Note:
+        Суффикс "Z" означает UTC (как и в HistoryStorage), явное смещение
+        (+03:00) учитывается; время без пояса считается локальным.
+    """
+    try:
+        return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def _is_newer_timestamp(new_ts: str, current_ts: str) -> bool:
+    """Проверить, что время new_ts позже current_ts.
+
+    Args:
+        new_ts: Новое время обновления в ISO формате
+        current_ts: Текущее время обновления в ISO формате
+
+    Returns:
+        True если new_ts строго позже current_ts
+
+    Raises:
+        ValueError: При некорректном формате времени
+        TypeError: Если время не строка
+
+    Note:
+        Время в каноническом формате приложения ("YYYY-MM-DDTHH:MM:SS.ffffffZ")
+        одинаковой длины упорядочено лексикографически и сравнивается как
+        строки; в остальных случаях (смещения, время без микросекунд)
+        выполняется разбор через datetime.fromisoformat.
+    """
+    if (
+        len(new_ts) == len(current_ts)
+        and new_ts[-1:] == "Z" == current_ts[-1:]
+        and new_ts[10:11] == "T" == current_ts[10:11]
+    ):
+        return new_ts > current_ts
+    new_time: datetime = datetime.fromisoformat(new_ts.replace("Z", "+00:00"))
+    current_time: datetime = datetime.fromisoformat(current_ts.replace("Z", "+00:00"))
+    return new_time > current_time
+
+
+# Живые экземпляры кэша; слабые ссылки не продлевают их жизнь, поэтому
+# обработчик atexit регистрируется один раз на модуль, а не на экземпляр
+_LIVE_CACHES: "weakref.WeakSet[RatesCache]" = weakref.WeakSet()
+
+
+def _flush_at_exit() -> None:
+    """Записать несохранённые изменения всех живых кэшей при завершении."""
+    for cache in list(_LIVE_CACHES):
+        try:
+            cache.flush()
+        except CacheError as e:
+            cache.logger.error(f"Запись кэша при завершении не выполнена: {e}")
+
+
+atexit.register(_flush_at_exit)
+
+
 # Экспорт публичных классов модуля rates_cache
 __all__ = [
     "CacheError",  # Исключение для ошибок работы кэша
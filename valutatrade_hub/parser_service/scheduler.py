@@ -2,35 +2,78 @@
 Модуль планировщика автоматического обновления курсов валют.
 """
 
+import dataclasses
 import logging
+import sched
 import threading
 import signal
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, Set
 from dataclasses import dataclass
 
 from .updater import RatesUpdater
 from .config import config
 from valutatrade_hub.core.exceptions import ApiRequestError
 
+# Имена сигналов по номеру (вычисляются один раз при импорте)
+_SIG_NAMES = {sig.value: sig.name for sig in signal.Signals}
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class SchedulerStatus:
-    """Статус планировщика обновлений."""
+    """Статус планировщика обновлений (неизменяемый снимок).
+
+    Note:
+        Время следующих обновлений хранится как Unix-время (float) и
+        форматируется в ISO строку только при чтении свойств next_*_update.
+        Планировщик заменяет снимок целиком, поэтому его можно отдавать
+        наружу без копирования.
+    """
 
     is_running: bool  # Флаг работы планировщика
     last_fiat_update: Optional[str]  # Время последнего обновления фиата
     last_crypto_update: Optional[str]  # Время последнего обновления крипто
-    next_fiat_update: Optional[str]  # Время следующего обновления фиата
-    next_crypto_update: Optional[str]  # Время следующего обновления крипто
+    next_fiat_update_ts: Optional[float]  # Unix-время следующего обновления фиата
+    next_crypto_update_ts: Optional[float]  # Unix-время следующего обновления крипто
     total_updates: int  # Всего выполненных обновлений
     failed_updates: int  # Неудачных обновлений
 
+    @property
+    def next_fiat_update(self) -> Optional[str]:
+        """Время следующего обновления фиата в ISO формате."""
+        return _format_timestamp(self.next_fiat_update_ts)
+
+    @property
+    def next_crypto_update(self) -> Optional[str]:
+        """Время следующего обновления крипто в ISO формате."""
+        return _format_timestamp(self.next_crypto_update_ts)
+
+
+def _format_timestamp(timestamp: Optional[float]) -> Optional[str]:
+    """Преобразовать Unix-время в локальную ISO строку.
+
+    Args:
+        timestamp: Unix-время или None
+
+    Returns:
+        ISO строка или None если время не задано
+    """
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp).isoformat()
+
 
 class RatesScheduler:
     """Планировщик автоматического обновления курсов валют."""
 
+    # Период логирования статуса планировщика
+    STATUS_LOG_INTERVAL_SECONDS: int = 60
+
+    # Максимальное ожидание завершения текущего обновления при остановке
+    STOP_TIMEOUT_SECONDS: float = 30.0
+
     def __init__(self, updater: RatesUpdater) -> None:
         """Инициализация планировщика обновлений.
 
@@ -40,22 +83,62 @@ class RatesScheduler:
         self.updater = updater  # Координатор обновления курсов
         self.logger = logging.getLogger("parser.scheduler")  # Логгер
 
-        # Загрузка интервалов из конфигурации
-        self.fiat_interval_seconds = config.FIAT_UPDATE_INTERVAL_MINUTES * 60
-        self.crypto_interval_seconds = config.CRYPTO_UPDATE_INTERVAL_MINUTES * 60
+        # Загрузка интервалов из конфигурации (один раз - дальше
+        # используются только сохраненные значения)
+        self._fiat_minutes = int(config.FIAT_UPDATE_INTERVAL_MINUTES)
+        self._crypto_minutes = int(config.CRYPTO_UPDATE_INTERVAL_MINUTES)
+        self.fiat_interval_seconds = self._fiat_minutes * 60
+        self.crypto_interval_seconds = self._crypto_minutes * 60
+
+        # Таблицы по типу обновления: интервал, источник и поля статуса
+        self._intervals = {
+            "fiat": self.fiat_interval_seconds,
+            "crypto": self.crypto_interval_seconds,
+        }
+        self._source_names = {"fiat": "ExchangeRate", "crypto": "CoinGecko"}
+        self._next_update_fields = {
+            "fiat": "next_fiat_update_ts",
+            "crypto": "next_crypto_update_ts",
+        }
+        self._last_update_fields = {
+            "fiat": "last_fiat_update",
+            "crypto": "last_crypto_update",
+        }
 
         # Состояние планировщика
         self._running = False  # Флаг работы планировщика
-        self._timers: List[threading.Timer] = []  # Список активных таймеров
         self._update_in_progress = False  # Флаг выполняющегося обновления
-
-        # Статистика работы
+        self._shutdown_event = threading.Event()  # Сигнал остановки
+
+        # Параллельные обновления (ALLOW_CONCURRENT_UPDATES): фиат и крипто
+        # выполняются в пуле потоков, но не более одного обновления каждого
+        # типа одновременно (семафор на тип)
+        self._allow_concurrent = bool(config.ALLOW_CONCURRENT_UPDATES)
+        self._source_slots = {
+            "fiat": threading.Semaphore(1),
+            "crypto": threading.Semaphore(1),
+        }
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending_updates: Set[Future] = set()
+
+        # Очередь событий (куча по монотонному времени) и единственный поток,
+        # который спит до ближайшего события; stop() прерывает ожидание
+        self._sched = sched.scheduler(time.monotonic, self._shutdown_event.wait)
+        self._sched_thread: Optional[threading.Thread] = None
+        # Постановка событий и их отмена в stop() выполняются под одной
+        # блокировкой: после остановки новые события не добавляются (иначе
+        # run() крутился бы на уже установленном _shutdown_event.wait)
+        self._sched_lock = threading.Lock()
+
+        # Статистика работы (заменяется целиком через _update_status);
+        # RLock - счетчики увеличиваются под той же блокировкой
+        self._status_lock = threading.RLock()
         self.status = SchedulerStatus(
             is_running=False,
             last_fiat_update=None,
             last_crypto_update=None,
-            next_fiat_update=None,
-            next_crypto_update=None,
+            next_fiat_update_ts=None,
+            next_crypto_update_ts=None,
             total_updates=0,
             failed_updates=0,
         )
@@ -64,8 +147,9 @@ class RatesScheduler:
         self._setup_signal_handlers()
 
         self.logger.info(
-            f"Планировщик инициализирован: фиат={self.fiat_interval_seconds}с, "
-            f"крипто={self.crypto_interval_seconds}с"
+            "Планировщик инициализирован: фиат=%sс, крипто=%sс",
+            self.fiat_interval_seconds,
+            self.crypto_interval_seconds,
         )
 
     def start(self) -> None:
@@ -75,22 +159,40 @@ class RatesScheduler:
             return
 
         self._running = True
-        self.status.is_running = True
+        self._update_status(is_running=True)
+        self._shutdown_event.clear()
 
         # Логирование запуска
         self.logger.info(
-            f"Запуск планировщика: фиат каждые "
-            f"{config.FIAT_UPDATE_INTERVAL_MINUTES} мин, "
-            f"крипто каждые {config.CRYPTO_UPDATE_INTERVAL_MINUTES} мин"
+            "Запуск планировщика: фиат каждые %s мин, крипто каждые %s мин",
+            self._fiat_minutes,
+            self._crypto_minutes,
         )
 
+        # Пул потоков для параллельных обновлений (по потоку на тип)
+        if self._allow_concurrent:
+            self._executor = ThreadPoolExecutor(
+                max_workers=len(self._source_slots),
+                thread_name_prefix="rates-update",
+            )
+
         # Планирование первого обновления
-        self._schedule_fiat_update(delay_seconds=0)  # Немедленно
-        self._schedule_crypto_update(delay_seconds=0)  # Немедленно
+        self._schedule_update("fiat", delay_seconds=0)  # Немедленно
+        self._schedule_update("crypto", delay_seconds=0)  # Немедленно
 
         # Логирование расписания
         self._log_next_schedule()
 
+        # Периодическое логирование статуса
+        self._schedule_status_log()
+
+        # Запуск потока планировщика (поток нельзя перезапустить - новый
+        # создается при каждом старте)
+        self._sched_thread = threading.Thread(
+            target=self._sched.run, name="rates-scheduler", daemon=True
+        )
+        self._sched_thread.start()
+
         # Ожидание завершения (если планировщик работает в основном потоке)
         if threading.current_thread() == threading.main_thread():
             self._wait_for_shutdown()
@@ -103,71 +205,82 @@ class RatesScheduler:
 
         self.logger.info("Остановка планировщика...")
         self._running = False
-        self.status.is_running = False
+        self._update_status(is_running=False)
+
+        with self._sched_lock:
+            # Пробуждение ожидающего основного потока
+            self._shutdown_event.set()
+
+            # Отмена всех запланированных событий - поток планировщика
+            # завершается, когда очередь пуста
+            for event in self._sched.queue:
+                try:
+                    self._sched.cancel(event)
+                except ValueError:
+                    pass  # Событие уже выполнено
+
+        # Ожидание завершения текущего обновления: поток планировщика
+        # выходит сразу после него (или сразу, если обновления нет)
+        sched_thread = self._sched_thread
+        if sched_thread is not None and sched_thread is not threading.current_thread():
+            if self._update_in_progress:
+                self.logger.info("Ожидание завершения текущего обновления...")
+            sched_thread.join(self.STOP_TIMEOUT_SECONDS)
+            if sched_thread.is_alive():
+                self.logger.warning(
+                    "Текущее обновление не завершилось за %sс, "
+                    "остановка без ожидания",
+                    self.STOP_TIMEOUT_SECONDS,
+                )
 
-        # Отмена всех активных таймеров
-        for timer in self._timers:
-            timer.cancel()
-        self._timers.clear()
+        # Ожидание обновлений, выполняющихся в пуле потоков
+        executor = self._executor
+        if executor is not None:
+            self._executor = None
+            _, not_done = wait(
+                list(self._pending_updates), timeout=self.STOP_TIMEOUT_SECONDS
+            )
+            if not_done:
+                self.logger.warning(
+                    "Обновления не завершились за %sс, остановка без ожидания",
+                    self.STOP_TIMEOUT_SECONDS,
+                )
+            executor.shutdown(wait=False)
 
-        # Ожидание завершения текущего обновления
-        if self._update_in_progress:
-            self.logger.info("Ожидание завершения текущего обновления...")
-            time.sleep(1)  # Краткая пауза
+        # Закрытие HTTP-сессий API клиентов
+        self.updater.close()
 
         self.logger.info(
-            f"Планировщик остановлен. Всего обновлений: "
-            f"{self.status.total_updates}, ошибок: {self.status.failed_updates}"
+            "Планировщик остановлен. Всего обновлений: %s, ошибок: %s",
+            self.status.total_updates,
+            self.status.failed_updates,
         )
 
     def get_status(self) -> SchedulerStatus:
         """Получить текущий статус планировщика.
 
         Returns:
-            Копия текущего статуса планировщика
+            Неизменяемый снимок текущего статуса планировщика (повторные
+            вызовы без изменений возвращают тот же объект)
         """
-        return SchedulerStatus(
-            is_running=self.status.is_running,
-            last_fiat_update=self.status.last_fiat_update,
-            last_crypto_update=self.status.last_crypto_update,
-            next_fiat_update=self.status.next_fiat_update,
-            next_crypto_update=self.status.next_crypto_update,
-            total_updates=self.status.total_updates,
-            failed_updates=self.status.failed_updates,
-        )
+        return self.status
 
-    def _schedule_fiat_update(self, delay_seconds: Optional[int] = None) -> None:
-        """Запланировать обновление фиатных курсов.
+    def _update_status(self, **changes: object) -> None:
+        """Заменить снимок статуса новым с измененными полями.
 
         Args:
-            delay_seconds: Задержка перед обновлением в секундах
-                          (по умолчанию интервал из конфигурации)
+            **changes: Новые значения полей SchedulerStatus
         """
-        if not self._running:
-            return
+        with self._status_lock:
+            self.status = dataclasses.replace(self.status, **changes)
 
-        # Использование интервала из конфигурации если задержка не указана
-        if delay_seconds is None:
-            delay_seconds = self.fiat_interval_seconds
-
-        # Создание и запуск таймера
-        timer = threading.Timer(
-            delay_seconds, self._run_scheduled_update, kwargs={"source_type": "fiat"}
-        )
-        timer.daemon = True  # Демон-поток для автоматического завершения
-        timer.start()
-        self._timers.append(timer)
-
-        # Обновление статуса следующего обновления
-        next_update_time = datetime.now().timestamp() + delay_seconds
-        self.status.next_fiat_update = datetime.fromtimestamp(
-            next_update_time
-        ).isoformat()
-
-    def _schedule_crypto_update(self, delay_seconds: Optional[int] = None) -> None:
-        """Запланировать обновление криптовалютных курсов.
+    def _schedule_update(
+        self, source_type: str, delay_seconds: Optional[int] = None
+    ) -> None:
+        """Запланировать обновление курсов указанного типа.
 
         Args:
+            source_type: Тип обновления ('fiat' или 'crypto')
             delay_seconds: Задержка перед обновлением в секундах
                           (по умолчанию интервал из конфигурации)
         """
@@ -176,112 +289,161 @@ class RatesScheduler:
 
         # Использование интервала из конфигурации если задержка не указана
         if delay_seconds is None:
-            delay_seconds = self.crypto_interval_seconds
+            delay_seconds = self._intervals[source_type]
+
+        # Добавление события в очередь планировщика (если stop() ещё не
+        # отменил очередь)
+        with self._sched_lock:
+            if self._shutdown_event.is_set():
+                return
+            self._sched.enter(
+                delay_seconds,
+                1,
+                self._run_scheduled_update,
+                kwargs={"source_type": source_type},
+            )
 
-        # Создание и запуск таймера
-        timer = threading.Timer(
-            delay_seconds, self._run_scheduled_update, kwargs={"source_type": "crypto"}
+        # Обновление статуса следующего обновления (форматируется при чтении)
+        self._update_status(
+            **{self._next_update_fields[source_type]: time.time() + delay_seconds}
         )
-        timer.daemon = True  # Демон-поток для автоматического завершения
-        timer.start()
-        self._timers.append(timer)
-
-        # Обновление статуса следующего обновления
-        next_update_time = datetime.now().timestamp() + delay_seconds
-        self.status.next_crypto_update = datetime.fromtimestamp(
-            next_update_time
-        ).isoformat()
 
     def _run_scheduled_update(self, source_type: str) -> None:
         """Выполнить запланированное обновление курсов.
 
         Args:
             source_type: Тип обновления ('fiat' или 'crypto')
+
+        Note:
+            По умолчанию обновление выполняется в потоке планировщика, и
+            следующее планируется после его завершения. При
+            ALLOW_CONCURRENT_UPDATES обновление передается пулу потоков, а
+            следующее планируется сразу через интервал; если предыдущее
+            обновление того же типа ещё выполняется, запуск пропускается.
         """
         # Проверка флага работы планировщика
         if not self._running:
             return
 
-        # Проверка на параллельные обновления
-        if self._update_in_progress and not config.ALLOW_CONCURRENT_UPDATES:
+        executor = self._executor
+        if executor is None:
+            try:
+                self._perform_update(source_type)
+            finally:
+                # Планирование следующего обновления
+                if self._running:
+                    self._schedule_update(source_type)
+            return
+
+        # Не более одного обновления каждого типа одновременно
+        slot = self._source_slots[source_type]
+        if slot.acquire(blocking=False):
+            try:
+                future = executor.submit(self._perform_update, source_type)
+            except RuntimeError:
+                # Пул уже закрыт остановкой планировщика
+                slot.release()
+                return
+            self._pending_updates.add(future)
+            future.add_done_callback(
+                lambda done: self._finish_concurrent_update(source_type, done)
+            )
+        else:
             self.logger.warning(
-                f"Пропущено обновление {source_type}: "
-                f"другое обновление уже выполняется"
+                "Предыдущее обновление %s ещё выполняется, запуск пропущен",
+                source_type,
             )
-            # Повторное планирование через короткий интервал
-            retry_delay = 30  # 30 секунд
-            if source_type == "fiat":
-                self._schedule_fiat_update(delay_seconds=retry_delay)
-            else:
-                self._schedule_crypto_update(delay_seconds=retry_delay)
-            return
 
+        # Планирование следующего обновления (в потоке планировщика)
+        self._schedule_update(source_type)
+
+    def _finish_concurrent_update(self, source_type: str, future: Future) -> None:
+        """Освободить слот типа после обновления в пуле потоков.
+
+        Args:
+            source_type: Тип обновления ('fiat' или 'crypto')
+            future: Завершенная задача обновления
+        """
+        self._pending_updates.discard(future)
+        self._source_slots[source_type].release()
+
+    def _perform_update(self, source_type: str) -> None:
+        """Обновить курсы указанного типа и учесть результат в статусе.
+
+        Args:
+            source_type: Тип обновления ('fiat' или 'crypto')
+        """
         # Установка флага выполняющегося обновления
         self._update_in_progress = True
 
         try:
             # Определение источника для обновления
-            source_name = "ExchangeRate" if source_type == "fiat" else "CoinGecko"
+            source_name = self._source_names[source_type]
             current_time = datetime.now().isoformat()
 
             # Логирование начала обновления
             self.logger.info(
-                f"Начало запланированного обновления {source_type} "
-                f"({source_name}) в {current_time}"
+                "Начало запланированного обновления %s (%s) в %s",
+                source_type,
+                source_name,
+                current_time,
             )
 
             # Выполнение обновления
             result = self.updater.run_update_for_source(source_name)
-            self.status.total_updates += 1
-
-            # Обновление времени последнего обновления
-            if source_type == "fiat":
-                self.status.last_fiat_update = current_time
-            else:
-                self.status.last_crypto_update = current_time
+            failed = result.status.name == "FAILED"
+
+            # Счетчики и время последнего обновления - одной заменой снимка
+            with self._status_lock:
+                self._update_status(
+                    total_updates=self.status.total_updates + 1,
+                    failed_updates=self.status.failed_updates + int(failed),
+                    **{self._last_update_fields[source_type]: current_time},
+                )
 
             # Обработка результата обновления
-            if result.status.name == "FAILED":
-                self.status.failed_updates += 1
+            if failed:
                 self.logger.error(
-                    f"Ошибка обновления {source_type}: {result.error_messages}"
+                    "Ошибка обновления %s: %s", source_type, result.error_messages
                 )
             else:
                 self.logger.info(
-                    f"Обновление {source_type} завершено: "
-                    f"{result.total_rates} курсов"
+                    "Обновление %s завершено: %s курсов",
+                    source_type,
+                    result.total_rates,
                 )
 
         except ApiRequestError as e:
             # Ошибка API при обновлении
-            self.status.failed_updates += 1
-            self.logger.error(f"Ошибка API при обновлении {source_type}: {e}")
+            self._count_failed_update()
+            self.logger.error("Ошибка API при обновлении %s: %s", source_type, e)
 
         except Exception as e:
             # Неожиданная ошибка при обновлении
-            self.status.failed_updates += 1
+            self._count_failed_update()
             self.logger.error(
-                f"Неожиданная ошибка при обновлении {source_type}: {e}", exc_info=True
+                "Неожиданная ошибка при обновлении %s: %s",
+                source_type,
+                e,
+                exc_info=True,
             )
 
         finally:
             # Сброс флага выполняющегося обновления
             self._update_in_progress = False
 
-            # Планирование следующего обновления
-            if self._running:
-                if source_type == "fiat":
-                    self._schedule_fiat_update()
-                else:
-                    self._schedule_crypto_update()
+    def _count_failed_update(self) -> None:
+        """Увеличить счетчик неудачных обновлений."""
+        with self._status_lock:
+            self._update_status(failed_updates=self.status.failed_updates + 1)
 
     def _setup_signal_handlers(self) -> None:
         """Настройка обработчиков сигналов для graceful shutdown."""
 
         def signal_handler(signum, frame):
             """Обработчик сигнала для graceful shutdown."""
-            signal_name = signal.Signals(signum).name
-            self.logger.info(f"Получен сигнал {signal_name}, остановка...")
+            signal_name = _SIG_NAMES.get(signum, str(signum))
+            self.logger.info("Получен сигнал %s, остановка...", signal_name)
             self.stop()
             # Выход из приложения после остановки планировщика
             raise SystemExit(0)
@@ -295,13 +457,9 @@ class RatesScheduler:
     def _wait_for_shutdown(self) -> None:
         """Ожидание сигнала завершения в основном потоке."""
         try:
-            # Бесконечное ожидание в основном потоке
-            while self._running:
-                time.sleep(1)  # Краткая пауза для уменьшения нагрузки CPU
-
-                # Периодическое логирование статуса (раз в минуту)
-                if int(time.time()) % 60 == 0:
-                    self._log_status()
+            # Поток спит до вызова stop() без периодических пробуждений;
+            # сигналы прерывают ожидание и вызывают обработчик
+            self._shutdown_event.wait()
 
         except KeyboardInterrupt:
             # Обработка Ctrl+C в основном потоке
@@ -310,23 +468,48 @@ class RatesScheduler:
 
         except Exception as e:
             # Неожиданная ошибка в основном потоке
-            self.logger.error(f"Ошибка в основном потоке: {e}")
+            self.logger.error("Ошибка в основном потоке: %s", e)
             self.stop()
             raise
 
+    def _schedule_status_log(self) -> None:
+        """Запланировать следующее логирование статуса планировщика."""
+        # Низкий приоритет: при совпадении времени обновления идут первыми
+        with self._sched_lock:
+            if self._shutdown_event.is_set():
+                return
+            self._sched.enter(
+                self.STATUS_LOG_INTERVAL_SECONDS, 2, self._log_status_periodic
+            )
+
+    def _log_status_periodic(self) -> None:
+        """Залогировать статус и запланировать следующее логирование."""
+        if self._shutdown_event.is_set():
+            return
+
+        self._log_status()
+        self._schedule_status_log()
+
     def _log_next_schedule(self) -> None:
         """Логирование расписания следующих обновлений."""
-        if self.status.next_fiat_update:
-            self.logger.info(
-                f"Следующее обновление фиата: {self.status.next_fiat_update}"
-            )
-        if self.status.next_crypto_update:
+        # Время форматируется только если сообщение будет выведено
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
+        status = self.status
+        if status.next_fiat_update_ts is not None:
+            self.logger.info("Следующее обновление фиата: %s", status.next_fiat_update)
+        if status.next_crypto_update_ts is not None:
             self.logger.info(
-                "Следующее обновление крипто: " f"{self.status.next_crypto_update}"
+                "Следующее обновление крипто: %s", status.next_crypto_update
             )
 
     def _log_status(self) -> None:
         """Логирование текущего статуса планировщика."""
+        # Сообщение собирается только если оно будет выведено
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
         status_msg = (
             f"Статус: запущен={self._running}, "
             f"обновлений={self.status.total_updates}, "
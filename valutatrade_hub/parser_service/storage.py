@@ -2,12 +2,42 @@
 Модуль хранилища исторических данных о курсах валют.
 """
 
-import json
+import bisect
+import functools
+import heapq
 import logging
-import shutil
+import mmap
+import operator
+import os
+import re
+import sys
+import uuid
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import (
+    Any,
+    BinaryIO,
+    DefaultDict,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from valutatrade_hub.infra import json_codec
+from valutatrade_hub.infra.settings import SettingsLoader
+
+from .rates_cache import _utc_now_iso
+
+# Ключ сортировки по времени без lambda-кадра; записи из файла на диске
+# не проверяются поштучно, поэтому отсутствие timestamp допускается
+_timestamp_key = operator.methodcaller("get", "timestamp", "")
+
+# Типичный код валюты (уже нормализованный) проверяется одним проходом _sre
+_match_plain_code = re.compile(r"[A-Z]{2,5}\Z").match
 
 
 class StorageError(Exception):
@@ -40,6 +70,43 @@ class HistoryStorage:
     # Константа версии формата данных
     DATA_VERSION: str = "1.0"
 
+    # Схема записи: обязательные поля задаются один раз на уровне класса,
+    # а не собираются в новый список при каждой проверке
+    RECORD_REQUIRED_FIELDS: Tuple[str, ...] = (
+        "from_currency",
+        "to_currency",
+        "rate",
+        "timestamp",
+        "source",
+    )
+    STORED_RECORD_REQUIRED_FIELDS: Tuple[str, ...] = ("id",) + RECORD_REQUIRED_FIELDS
+    META_REQUIRED_FIELDS: Tuple[str, ...] = ("raw_id", "request_ms", "status_code")
+    # Те же наборы как frozenset для проверки подмножества одной операцией
+    RECORD_REQUIRED_SET: FrozenSet[str] = frozenset(RECORD_REQUIRED_FIELDS)
+    STORED_RECORD_REQUIRED_SET: FrozenSet[str] = frozenset(
+        STORED_RECORD_REQUIRED_FIELDS
+    )
+    META_REQUIRED_SET: FrozenSet[str] = frozenset(META_REQUIRED_FIELDS)
+    CURRENCY_FIELDS: Tuple[str, ...] = ("from_currency", "to_currency")
+    # Строковые поля с малым набором значений (коды, источник, метка пакета),
+    # которые интернируются, чтобы одинаковые значения были одним объектом
+    INTERNED_FIELDS: Tuple[str, ...] = (
+        "from_currency",
+        "to_currency",
+        "source",
+        "timestamp",
+    )
+    REQUIRED_TOP_FIELDS: Tuple[str, ...] = (
+        "version",
+        "last_updated",
+        "total_records",
+        "records",
+    )
+    REQUIRED_TOP_SET: FrozenSet[str] = frozenset(REQUIRED_TOP_FIELDS)
+
+    # Число записей в журнале, после которого журнал сворачивается в снимок
+    JOURNAL_COMPACT_THRESHOLD: int = 500
+
     def __init__(self, filepath: str = "data/exchange_rates.json") -> None:
         """Инициализация хранилища исторических данных.
         Args:
@@ -66,12 +133,33 @@ class HistoryStorage:
 
         # Инициализация данных в памяти
         self._data: Optional[Dict[str, Any]] = None
+
+        # Проверка записанного снимка повторным чтением (для тестов/отладки)
+        self._verify_writes: bool = bool(
+            SettingsLoader().get("storage_verify_writes", False)
+        )
+
+        # Журнал добавленных записей (JSON Lines рядом с основным файлом):
+        # первая строка - заголовок {"base": snapshot_id}, далее по записи
+        # на строку. Основной файл перезаписывается только при сворачивании.
+        self._journal_path: Path = self.filepath.with_suffix(".jsonl")
+        self._journal: Optional[BinaryIO] = None  # Открытый на дозапись журнал
+        self._journal_records: int = 0  # Записей в журнале после снимка
+        self._journal_reset_needed: bool = True  # Журнал нужно создать заново
+
+        # Индексы записей в памяти (перестраиваются при загрузке данных):
+        # код валюты -> записи с этой валютой (исходной или целевой) и
+        # записи, упорядоченные по времени, с параллельным списком epoch-ключей
+        self._by_currency: DefaultDict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._ts_keys: List[float] = []
+        self._ts_records: List[Dict[str, Any]] = []
+
         self.logger.info(f"Хранилище инициализировано: {self.filepath}")
 
     def generate_id(self, from_currency: str, to_currency: str, timestamp: str) -> str:
         """ID = FROMTO_ISO (BTCUSD_20260110T143000Z)."""
-        from_cur = from_currency.upper().strip()
-        to_cur = to_currency.upper().strip()
+        from_cur = _normalize_code(from_currency)
+        to_cur = _normalize_code(to_currency)
         # "2025-10-10T12:00:00Z" -> "20251010T120000Z"
         ts_clean = timestamp.replace("-", "").replace(":", "").rpartition(".")[0] + "Z"
         record_id = f"{from_cur}{to_cur}_{ts_clean}"
@@ -82,13 +170,12 @@ class HistoryStorage:
 
     def validate_record(self, record: Dict[str, Any]) -> bool:
         """Валидация: required + формат + meta."""
-        required = ["from_currency", "to_currency", "rate", "timestamp", "source"]
-        for field in required:
-            if field not in record:
-                self.logger.warning(
-                    f"Missing: {field} in {record.get('id', 'unknown')}"
-                )
-                return False
+        field = _first_missing(
+            record, self.RECORD_REQUIRED_FIELDS, self.RECORD_REQUIRED_SET
+        )
+        if field is not None:
+            self.logger.warning(f"Missing: {field} in {record.get('id', 'unknown')}")
+            return False
 
         # UPPER 2-5 символов
         if not (
@@ -102,11 +189,12 @@ class HistoryStorage:
             self.logger.warning("Missing meta")
             return False
         # meta required
-        meta_req = ["raw_id", "request_ms", "status_code"]
-        for mfield in meta_req:
-            if mfield not in record["meta"]:
-                self.logger.warning(f"Missing meta.{mfield}")
-                return False
+        mfield = _first_missing(
+            record["meta"], self.META_REQUIRED_FIELDS, self.META_REQUIRED_SET
+        )
+        if mfield is not None:
+            self.logger.warning(f"Missing meta.{mfield}")
+            return False
         return True
 
     def save_record(self, record_data: Dict[str, Any]) -> str:
@@ -129,17 +217,12 @@ class HistoryStorage:
         )
 
         # 1. Валидация обязательных полей записи
-        required_fields: List[str] = [
-            "from_currency",
-            "to_currency",
-            "rate",
-            "timestamp",
-            "source",
-        ]
-        for field in required_fields:
-            if field not in record_data:
-                # Отсутствие обязательного поля
-                raise ValueError(f"Отсутствует обязательное поле: {field}")
+        missing: Optional[str] = _first_missing(
+            record_data, self.RECORD_REQUIRED_FIELDS, self.RECORD_REQUIRED_SET
+        )
+        if missing is not None:
+            # Отсутствие обязательного поля
+            raise ValueError(f"Отсутствует обязательное поле: {missing}")
 
         # 2. Генерация уникального ID для записи
         record_id: str = self._generate_id(
@@ -167,13 +250,18 @@ class HistoryStorage:
                 operation="save_record",
             )
 
-        # 6. Добавление записи в данные
+        # 6. Дозапись записи в журнал (основной файл не перезаписывается)
+        self._append_journal([record_data_with_id])
+
+        # 7. Добавление записи в данные и индексы
         self._data["records"].append(record_data_with_id)
+        self._index_records([record_data_with_id])
         self._data["total_records"] = len(self._data["records"])
-        self._data["last_updated"] = datetime.now().isoformat() + "Z"
+        self._data["last_updated"] = _utc_now_iso()
 
-        # 7. Атомарная запись обновленных данных в файл
-        self._atomic_write(self._data)
+        # 8. Сворачивание журнала в снимок при превышении порога
+        if self._journal_records >= self.JOURNAL_COMPACT_THRESHOLD:
+            self.compact()
 
         # Логирование успешного сохранения
         self.logger.info(
@@ -182,11 +270,16 @@ class HistoryStorage:
 
         return record_id  # Возврат уникального ID сохраненной записи
 
-    def save_batch(self, records: List[Dict[str, Any]]) -> List[str]:
+    def save_batch(
+        self, records: List[Dict[str, Any]], fast_mode: bool = False
+    ) -> List[str]:
         """Сохранить несколько записей о курсах валют атомарно.
 
         Args:
             records: Список записей для сохранения (каждая в формате ТЗ4)
+            fast_mode: Если True, ID проставляется прямо в переданные словари
+                без создания копий (для свежих записей, которыми вызывающий
+                код больше не пользуется)
 
         Returns:
             Список уникальных идентификаторов сохраненных записей
@@ -198,6 +291,8 @@ class HistoryStorage:
         Note:
             Все записи сохраняются одной атомарной операцией.
             При ошибке валидации одной записи вся операция отменяется.
+            В режиме fast_mode уже обработанные словари при такой ошибке
+            остаются с проставленным полем "id".
         """
         # Логирование начала пакетного сохранения
         self.logger.info(f"Пакетное сохранение {len(records)} записей")
@@ -209,21 +304,17 @@ class HistoryStorage:
 
         saved_ids: List[str] = []  # Список для хранения ID сохраненных записей
         records_with_ids: List[Dict[str, Any]] = []  # Список записей с ID
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
 
-        # 2. Обработка каждой записи в пакете
+        # 2. Обработка каждой записи в пакете за один проход
         for i, record in enumerate(records):
             try:
                 # Валидация обязательных полей для каждой записи
-                required_fields: List[str] = [
-                    "from_currency",
-                    "to_currency",
-                    "rate",
-                    "timestamp",
-                    "source",
-                ]
-                for field in required_fields:
-                    if field not in record:
-                        raise ValueError(f"Запись {i}: отсутствует поле {field}")
+                missing = _first_missing(
+                    record, self.RECORD_REQUIRED_FIELDS, self.RECORD_REQUIRED_SET
+                )
+                if missing is not None:
+                    raise ValueError(f"Запись {i}: отсутствует поле {missing}")
 
                 # Генерация уникального ID для записи
                 record_id: str = self._generate_id(
@@ -232,8 +323,8 @@ class HistoryStorage:
                     timestamp=record["timestamp"],
                 )
 
-                # Создание копии записи с добавленным ID
-                record_with_id: Dict[str, Any] = record.copy()
+                # В быстром режиме ID проставляется на месте, иначе в копию
+                record_with_id: Dict[str, Any] = record if fast_mode else record.copy()
                 record_with_id["id"] = record_id
 
                 # Валидация полной структуры записи
@@ -244,9 +335,13 @@ class HistoryStorage:
                 records_with_ids.append(record_with_id)
                 saved_ids.append(record_id)
 
-                self.logger.debug(
-                    f"Подготовлена запись {i+1}/{len(records)}: {record_id}"
-                )
+                if debug_enabled:
+                    self.logger.debug(
+                        "Подготовлена запись %d/%d: %s",
+                        i + 1,
+                        len(records),
+                        record_id,
+                    )
 
             except Exception as e:
                 # Ошибка обработки записи - отмена всей операции
@@ -265,13 +360,18 @@ class HistoryStorage:
                 operation="save_batch",
             )
 
-        # 4. Добавление всех записей в данные
+        # 4. Дозапись всего пакета в журнал одной операцией записи
+        self._append_journal(records_with_ids)
+
+        # 5. Добавление всех записей в данные и индексы
         self._data["records"].extend(records_with_ids)
+        self._index_records(records_with_ids)
         self._data["total_records"] = len(self._data["records"])
-        self._data["last_updated"] = datetime.now().isoformat() + "Z"
+        self._data["last_updated"] = _utc_now_iso()
 
-        # 5. Атомарная запись обновленных данных в файл
-        self._atomic_write(self._data)
+        # 6. Сворачивание журнала в снимок при превышении порога
+        if self._journal_records >= self.JOURNAL_COMPACT_THRESHOLD:
+            self.compact()
 
         # Логирование успешного пакетного сохранения
         self.logger.info(
@@ -281,6 +381,46 @@ class HistoryStorage:
 
         return saved_ids  # Возврат списка ID сохраненных записей
 
+    def compact(self) -> None:
+        """Свернуть журнал в основной файл и начать новый журнал.
+
+        Raises:
+            StorageError: При ошибках записи снимка или журнала
+
+        Note:
+            Снимок получает новый snapshot_id, а новый журнал - заголовок
+            с этим же ID. Если процесс упадет между записью снимка и
+            сбросом журнала, старый журнал не совпадет по ID со снимком и
+            не будет повторно применен при загрузке.
+        """
+        if self._data is None:
+            return  # Данные не загружались - сворачивать нечего
+
+        # 1. Атомарная запись снимка со всеми записями под новым ID
+        snapshot_id: str = uuid.uuid4().hex
+        self._data["snapshot_id"] = snapshot_id
+        self._atomic_write(self._data)
+
+        # 2. Новый пустой журнал, привязанный к записанному снимку
+        self._reset_journal(snapshot_id)
+
+        self.logger.info(
+            f"Журнал свернут в {self.filepath}, всего записей: "
+            f"{self._data['total_records']}"
+        )
+
+    def close(self) -> None:
+        """Свернуть непустой журнал в основной файл и закрыть его.
+
+        Raises:
+            StorageError: При ошибках записи снимка или журнала
+        """
+        if self._journal_records:
+            self.compact()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
     def load_all(self) -> List[Dict[str, Any]]:
         """Загрузить все исторические записи о курсах валют.
 
@@ -312,6 +452,30 @@ class HistoryStorage:
 
         return records_copy  # Возврат копии списка записей
 
+    def iter_all(self) -> Iterator[Dict[str, Any]]:
+        """Итерироваться по всем записям без создания копии списка.
+
+        Returns:
+            Итератор по записям в хронологическом порядке (от старых к новым)
+
+        Raises:
+            StorageError: Если данные хранилища не удалось загрузить
+
+        Note:
+            Возвращаются сами записи хранилища, а не копии: изменять их и
+            сохранять новые записи во время обхода нельзя. Для независимого
+            снимка используйте load_all().
+        """
+        if self._data is None:
+            self._load_data()
+
+        if self._data is None:
+            raise StorageError(
+                "Не удалось загрузить данные хранилища", operation="iter_all"
+            )
+
+        return iter(self._data["records"])
+
     def get_by_currency(
         self, currency_code: str, limit: int = 100
     ) -> List[Dict[str, Any]]:
@@ -329,7 +493,7 @@ class HistoryStorage:
             Возвращаются записи отсортированные по времени (новые первые).
         """
         # Нормализация кода валюты для поиска
-        search_code: str = currency_code.upper().strip()
+        search_code: str = _normalize_code(currency_code)
 
         # 1. Загрузка всех записей если они еще не загружены
         if self._data is None:
@@ -341,26 +505,21 @@ class HistoryStorage:
                 "Не удалось загрузить данные хранилища", operation="get_by_currency"
             )
 
-        # 2. Фильтрация записей по коду валюты
-        matching_records: List[Dict[str, Any]] = []
-        for record in self._data["records"]:
-            # Проверка валюты в записи (исходная или целевая)
-            if (
-                record.get("from_currency", "").upper() == search_code
-                or record.get("to_currency", "").upper() == search_code
-            ):
-                matching_records.append(record)
-
-        # 3. Сортировка по времени (от новых к старым)
-        matching_records.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+        # 2. Записи с валютой из индекса (без обхода всех записей)
+        matching_records: List[Dict[str, Any]] = self._by_currency.get(search_code, [])
 
-        # 4. Ограничение количества возвращаемых записей
-        result: List[Dict[str, Any]] = matching_records[:limit]
+        # 3. Выбор limit самых новых записей через кучу: O(m log limit)
+        # вместо полной сортировки; порядок совпадает с sorted(...)[:limit]
+        result: List[Dict[str, Any]] = heapq.nlargest(
+            limit, matching_records, key=_timestamp_key
+        )
 
         # Логирование операции поиска
         self.logger.debug(
-            f"Найдено {len(result)} записей по валюте {search_code} "
-            f"(всего совпадений: {len(matching_records)})"
+            "Найдено %d записей по валюте %s (всего совпадений: %d)",
+            len(result),
+            search_code,
+            len(matching_records),
         )
 
         return result  # Возврат отфильтрованных записей
@@ -381,64 +540,84 @@ class HistoryStorage:
         Note:
             Включает записи с timestamp >= start_date и <= end_date.
         """
+        lo, hi = self._period_bounds(start_date, end_date, "get_by_period")
+        period_records: List[Dict[str, Any]] = self._ts_records[lo:hi]
+
+        # Логирование операции фильтрации по периоду
+        self.logger.debug(
+            f"Найдено {len(period_records)} записей за период "
+            f"{start_date} - {end_date}"
+        )
+
+        return period_records  # Возврат записей за период
+
+    def iter_by_period(
+        self, start_date: str, end_date: str
+    ) -> Iterator[Dict[str, Any]]:
+        """Итерироваться по записям за период без создания списка-среза.
+
+        Args:
+            start_date: Начальная дата периода в ISO формате
+            end_date: Конечная дата периода в ISO формате
+
+        Returns:
+            Итератор по записям за период в хронологическом порядке
+
+        Raises:
+            ValueError: При некорректном формате дат или если start_date > end_date
+
+        Note:
+            Границы периода вычисляются сразу при вызове, поэтому ошибки
+            в датах возникают здесь, а не при первом next(). Записи
+            не копируются - изменять хранилище во время обхода нельзя.
+        """
+        lo, hi = self._period_bounds(start_date, end_date, "iter_by_period")
+        ts_records = self._ts_records
+        return (ts_records[i] for i in range(lo, hi))
+
+    def _period_bounds(
+        self, start_date: str, end_date: str, operation: str
+    ) -> Tuple[int, int]:
+        """Найти границы периода в индексе времени бинарным поиском.
+
+        Args:
+            start_date: Начальная дата периода в ISO формате
+            end_date: Конечная дата периода в ISO формате
+            operation: Имя вызывающей операции для StorageError
+
+        Returns:
+            Пара (lo, hi) - полуинтервал позиций в self._ts_records
+
+        Raises:
+            ValueError: При некорректном формате дат или если start_date > end_date
+            StorageError: Если данные хранилища не удалось загрузить
+        """
         try:
-            # Парсинг дат для сравнения
-            start_dt: datetime = datetime.fromisoformat(
-                start_date.replace("Z", "+00:00")
-            )
-            end_dt: datetime = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
+            # Парсинг дат в epoch для сравнения с ключами индекса
+            start_ts: float = _parse_timestamp(start_date)
+            end_ts: float = _parse_timestamp(end_date)
         except ValueError as e:
             # Некорректный формат даты
             raise ValueError(f"Некорректный формат даты: {e}") from e
 
         # Проверка что start_date <= end_date
-        if start_dt > end_dt:
+        if start_ts > end_ts:
             raise ValueError(f"Начальная дата {start_date} позже конечной {end_date}")
 
-        # 1. Загрузка всех записей если они еще не загружены
+        # Загрузка всех записей если они еще не загружены
         if self._data is None:
             self._load_data()
 
         # Убедимся что self._data не None после загрузки
         if self._data is None:
             raise StorageError(
-                "Не удалось загрузить данные хранилища", operation="get_by_period"
+                "Не удалось загрузить данные хранилища", operation=operation
             )
 
-        # 2. Фильтрация записей по периоду
-        period_records: List[Dict[str, Any]] = []
-        for record in self._data["records"]:
-            try:
-                # Парсинг timestamp записи
-                record_timestamp: str = record.get("timestamp", "")
-                if not record_timestamp:
-                    continue  # Пропуск записей без timestamp
-
-                record_dt: datetime = datetime.fromisoformat(
-                    record_timestamp.replace("Z", "+00:00")
-                )
-
-                # Проверка что запись входит в период
-                if start_dt <= record_dt <= end_dt:
-                    period_records.append(record)
-
-            except ValueError:
-                # Некорректный формат timestamp в записи - пропуск
-                self.logger.warning(
-                    f"Некорректный формат timestamp в записи: {record.get('id', 'unknown')}"
-                )
-                continue
-
-        # 3. Сортировка по времени (от старых к новым)
-        period_records.sort(key=lambda x: x.get("timestamp", ""))
-
-        # Логирование операции фильтрации по периоду
-        self.logger.debug(
-            f"Найдено {len(period_records)} записей за период "
-            f"{start_date} - {end_date}"
-        )
-
-        return period_records  # Возврат записей за период
+        # Записи в индексе уже упорядочены от старых к новым
+        lo: int = bisect.bisect_left(self._ts_keys, start_ts)
+        hi: int = bisect.bisect_right(self._ts_keys, end_ts)
+        return lo, hi
 
     def _generate_id(self, from_currency: str, to_currency: str, timestamp: str) -> str:
         """Сгенерировать уникальный идентификатор для записи о курсе.
@@ -456,8 +635,8 @@ class HistoryStorage:
             Пример: BTC_USD_2025-10-10T12:00:00Z
         """
         # Нормализация кодов валют (верхний регистр, без пробелов)
-        from_norm: str = from_currency.upper().strip().replace(" ", "_")
-        to_norm: str = to_currency.upper().strip().replace(" ", "_")
+        from_norm: str = _normalize_code(from_currency).replace(" ", "_")
+        to_norm: str = _normalize_code(to_currency).replace(" ", "_")
 
         # Нормализация timestamp (убедиться что есть Z в конце)
         ts_norm: str = timestamp.strip()
@@ -483,18 +662,14 @@ class HistoryStorage:
             Логирует предупреждения при обнаружении проблем.
         """
         # 1. Проверка наличия обязательных полей
-        required_fields: List[str] = [
-            "id",
-            "from_currency",
-            "to_currency",
-            "rate",
-            "timestamp",
-            "source",
-        ]
-        for field in required_fields:
-            if field not in record:
-                self.logger.warning(f"Отсутствует обязательное поле: {field}")
-                return False
+        missing: Optional[str] = _first_missing(
+            record,
+            self.STORED_RECORD_REQUIRED_FIELDS,
+            self.STORED_RECORD_REQUIRED_SET,
+        )
+        if missing is not None:
+            self.logger.warning(f"Отсутствует обязательное поле: {missing}")
+            return False
 
         # 2. Проверка формата ID
         if not isinstance(record["id"], str) or not record["id"]:
@@ -502,13 +677,18 @@ class HistoryStorage:
             return False
 
         # 3. Проверка форматов кодов валют (2-5 символов, верхний регистр)
-        for currency_field in ["from_currency", "to_currency"]:
+        for currency_field in self.CURRENCY_FIELDS:
             currency_code: str = record[currency_field]
             if not isinstance(currency_code, str):
                 self.logger.warning(f"Некорректный тип {currency_field}")
                 return False
 
-            currency_norm: str = currency_code.upper().strip()
+            # Быстрый путь: код уже в верхнем регистре без пробелов
+            if _match_plain_code(currency_code):
+                continue
+
+            # Иначе прежняя проверка длины нормализованного кода
+            currency_norm: str = _normalize_code(currency_code)
             if not (2 <= len(currency_norm) <= 5):
                 self.logger.warning(
                     f"Некорректная длина кода валюты {currency_field}: {currency_norm}"
@@ -527,10 +707,9 @@ class HistoryStorage:
 
         # 5. Проверка формата timestamp (ISO 8601)
         try:
-            ts: str = record["timestamp"]
-            # Попытка парсинга ISO timestamp
-            datetime.fromisoformat(ts.replace("Z", "+00:00"))
-        except (ValueError, AttributeError):
+            # Попытка парсинга ISO timestamp (с кэшем по строке)
+            _parse_timestamp(record["timestamp"])
+        except (ValueError, TypeError):
             self.logger.warning(f"Некорректный формат timestamp: {record['timestamp']}")
             return False
 
@@ -557,13 +736,13 @@ class HistoryStorage:
             # Файл не существует - создание структуры по умолчанию
             self.logger.info(f"Файл не существует, создается новый: {self.filepath}")
             self._data = self._create_default_structure()
+            # Записи могли быть сохранены только в журнал (до первого снимка)
+            self._finish_load()
             return
 
         try:
-            # Открытие файла для чтения в UTF-8 кодировке
-            with open(self.filepath, "r", encoding="utf-8") as f:
-                # Загрузка и парсинг JSON данных
-                file_data: Dict[str, Any] = json.load(f)
+            # Чтение и парсинг JSON данных через mmap (orjson если установлен)
+            file_data: Dict[str, Any] = self._read_data_file()
 
             # Валидация структуры загруженных данных
             if not self._validate_data_structure(file_data):
@@ -576,7 +755,7 @@ class HistoryStorage:
                     f"Загружено {self._data['total_records']} записей из файла"
                 )
 
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             # Ошибка парсинга JSON - создаем структуру по умолчанию
             self.logger.error(f"Ошибка парсинга JSON файла: {e}")
             self._data = self._create_default_structure()
@@ -593,6 +772,233 @@ class HistoryStorage:
                 operation="_load_data",
             )
 
+        self._finish_load()
+
+    def _read_data_file(self) -> Dict[str, Any]:
+        """Прочитать и распарсить основной файл через mmap.
+
+        Returns:
+            Распарсенные данные файла
+
+        Raises:
+            ValueError: При пустом файле или некорректном JSON
+            OSError: При ошибках открытия или отображения файла
+
+        Note:
+            Файл отображается в память только для чтения: orjson (если
+            установлен) разбирает его без промежуточной копии в bytes.
+        """
+        with open(self.filepath, "rb") as f:
+            # mmap не поддерживает файлы нулевой длины
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError("Файл хранилища пустой")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # memoryview освобождается до закрытия mmap
+                with memoryview(mm) as view:
+                    return json_codec.loads(view)
+
+    def _finish_load(self) -> None:
+        """Дополнить загруженный снимок журналом и построить индексы."""
+        # Применение записей журнала, добавленных после снимка
+        self._replay_journal()
+
+        # Построение индексов по всем загруженным записям
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self) -> None:
+        """Перестроить индексы по валюте и времени для данных в памяти."""
+        self._by_currency.clear()
+        self._ts_keys.clear()
+        self._ts_records.clear()
+        if self._data is not None:
+            self._index_records(self._data["records"])
+
+    def _index_records(self, records: List[Dict[str, Any]]) -> None:
+        """Добавить записи в индексы по валюте и времени.
+
+        Args:
+            records: Новые записи (уже добавленные в self._data)
+
+        Note:
+            Записи с некорректным timestamp не попадают в индекс времени
+            и не возвращаются get_by_period (как и раньше).
+            Через этот метод проходит каждая запись (загрузка, журнал,
+            сохранение), поэтому здесь же интернируются INTERNED_FIELDS.
+        """
+        ts_keys = self._ts_keys
+        ts_records = self._ts_records
+        interned_fields = self.INTERNED_FIELDS
+        for record in records:
+            # Дедупликация повторяющихся строк: тысячи "USD"/"BTC" в памяти
+            # становятся ссылками на один объект
+            for field in interned_fields:
+                value = record.get(field)
+                if type(value) is str:
+                    record[field] = sys.intern(value)
+
+            # Индекс по валюте: запись попадает в список каждой своей валюты
+            # (ключ нормализован так же, как код в get_by_currency)
+            from_code: str = _normalize_code(record.get("from_currency", ""))
+            to_code: str = _normalize_code(record.get("to_currency", ""))
+            self._by_currency[from_code].append(record)
+            if to_code != from_code:
+                self._by_currency[to_code].append(record)
+
+            # Индекс по времени
+            record_timestamp: Any = record.get("timestamp", "")
+            if not record_timestamp:
+                continue  # Пропуск записей без timestamp
+            try:
+                ts_key: float = _parse_timestamp(record_timestamp)
+            except (TypeError, ValueError):
+                # Не строка (число из старого или отредактированного файла)
+                # или строка не в ISO формате
+                self.logger.warning(
+                    "Некорректный формат timestamp в записи: "
+                    f"{record.get('id', 'unknown')}"
+                )
+                continue
+
+            # Записи обычно приходят по возрастанию времени - добавление в
+            # конец; иначе вставка с сохранением порядка равных ключей
+            if not ts_keys or ts_key >= ts_keys[-1]:
+                ts_keys.append(ts_key)
+                ts_records.append(record)
+            else:
+                pos: int = bisect.bisect_right(ts_keys, ts_key)
+                ts_keys.insert(pos, ts_key)
+                ts_records.insert(pos, record)
+
+    def _replay_journal(self) -> None:
+        """Применить к загруженному снимку записи из журнала.
+
+        Note:
+            Журнал применяется только если его заголовок ссылается на
+            snapshot_id загруженного снимка; иначе его записи уже входят в
+            снимок (сбой между записью снимка и сбросом журнала) или снимок
+            был пересоздан, и журнал будет создан заново при первой записи.
+            Недописанная последняя строка (сбой во время дозаписи) пропускается.
+        """
+        self._journal_records = 0
+        self._journal_reset_needed = True
+
+        if self._data is None or not self._journal_path.exists():
+            return
+
+        try:
+            with open(self._journal_path, "rb") as f:
+                lines: List[bytes] = f.read().splitlines()
+        except OSError as e:
+            self.logger.error(f"Ошибка чтения журнала: {e}")
+            return
+
+        try:
+            header: Dict[str, Any] = json_codec.loads(lines[0]) if lines else {}
+        except ValueError:
+            header = {}
+        if not lines or header.get("base") != self._data.get("snapshot_id"):
+            self.logger.info("Журнал не относится к текущему снимку, пропуск")
+            return
+
+        replayed: List[Dict[str, Any]] = []
+        for line in lines[1:]:
+            try:
+                replayed.append(json_codec.loads(line))
+            except ValueError:
+                # Недописанная строка - дальше журнала нет корректных данных
+                self.logger.warning("Пропущена поврежденная строка журнала")
+                break
+
+        self._data["records"].extend(replayed)
+        self._data["total_records"] = len(self._data["records"])
+        self._journal_records = len(replayed)
+        self._journal_reset_needed = False
+
+        if replayed:
+            self.logger.debug(f"Из журнала применено {len(replayed)} записей")
+
+    def _reset_journal(self, base: Optional[str]) -> None:
+        """Создать новый пустой журнал, привязанный к снимку.
+
+        Args:
+            base: snapshot_id снимка, к которому относится журнал
+
+        Raises:
+            StorageError: При ошибках записи журнала
+        """
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+        temp_path: Path = self._journal_path.with_suffix(".jsonl.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(json_codec.dumps({"base": base}) + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+            temp_path.replace(self._journal_path)
+        except OSError as e:
+            temp_path.unlink(missing_ok=True)
+            raise StorageError(
+                f"Ошибка создания журнала: {e}", operation="_reset_journal"
+            ) from e
+
+        self._journal_records = 0
+        self._journal_reset_needed = False
+
+    def _append_journal(self, records: List[Dict[str, Any]]) -> None:
+        """Дописать записи в журнал (по одной JSON строке на запись).
+
+        Args:
+            records: Записи с ID для сохранения
+
+        Raises:
+            StorageError: При ошибках записи журнала
+
+        Note:
+            Пакет пишется одной операцией write с последующими flush и fsync,
+            поэтому стоимость сохранения не зависит от размера истории.
+        """
+        if self._data is None:
+            raise StorageError(
+                "Данные хранилища не загружены", operation="_append_journal"
+            )
+
+        if self._journal_reset_needed:
+            self._reset_journal(self._data.get("snapshot_id"))
+
+        try:
+            payload: bytes = b"".join(
+                json_codec.dumps(record, default=str) + b"\n" for record in records
+            )
+        except (TypeError, ValueError) as e:
+            raise StorageError(
+                f"Ошибка сериализации записей: {e}", operation="_append_journal"
+            ) from e
+
+        start_pos: Optional[int] = None
+        try:
+            if self._journal is None:
+                self._journal = open(self._journal_path, "ab")
+            start_pos = self._journal.tell()
+
+            self._journal.write(payload)
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+        except OSError as e:
+            # Откат недописанного пакета, чтобы следующие строки журнала
+            # не склеились с обрывком
+            if self._journal is not None and start_pos is not None:
+                try:
+                    self._journal.truncate(start_pos)
+                except OSError:
+                    pass
+            raise StorageError(
+                f"Ошибка записи журнала: {e}", operation="_append_journal"
+            ) from e
+
+        self._journal_records += len(records)
+
     def _validate_data_structure(self, data: Dict[str, Any]) -> bool:
         """Валидация структуры данных файла.
 
@@ -602,14 +1008,18 @@ class HistoryStorage:
         Returns:
             True если структура валидна, False если нет
         """
-        # Проверка обязательных полей верхнего уровня
-        required_top_fields: List[str] = [
-            "version",
-            "last_updated",
-            "total_records",
-            "records",
-        ]
-        for field in required_top_fields:
+        # Быстрый путь: все проверки одним выражением без логирования
+        # (JSON файла может оказаться и не объектом - тогда медленный путь)
+        if (
+            isinstance(data, dict)
+            and self.REQUIRED_TOP_SET <= data.keys()
+            and isinstance(data["records"], list)
+            and data["total_records"] == len(data["records"])
+        ):
+            return True
+
+        # Медленный путь только при ошибке - найти и залогировать причину
+        for field in self.REQUIRED_TOP_FIELDS:
             if field not in data:
                 self.logger.warning(f"Отсутствует поле верхнего уровня: {field}")
                 return False
@@ -636,7 +1046,7 @@ class HistoryStorage:
         Returns:
             Словарь с структурой данных по умолчанию
         """
-        current_time: str = datetime.now().isoformat() + "Z"
+        current_time: str = _utc_now_iso()
 
         default_structure: Dict[str, Any] = {
             "version": self.DATA_VERSION,
@@ -658,76 +1068,75 @@ class HistoryStorage:
             StorageError: При ошибках записи, проверки целостности или переименования
 
         Note:
-            Использует паттерн временный файл → проверка → атомарное переименование
-            для гарантии целостности данных даже при сбоях системы.
+            Использует паттерн временный файл → атомарное переименование:
+            os.replace гарантирует, что файл всегда содержит либо старую, либо
+            новую версию, поэтому backup-копия не нужна. Снимок пишется
+            напрямую через дескриптор: данные уже сериализованы в bytes, и
+            буферизованный слой Python дал бы только лишнее копирование.
+            Снимок перечитывается для проверки, только если задана настройка
+            storage_verify_writes. После переименования выполняется fsync
+            директории, чтобы новое имя пережило сбой до сброса журнала.
         """
-        # Создание путей к временному и основному файлам
+        # Создание пути к временному файлу
         temp_filepath: Path = self.filepath.with_suffix(".tmp")
-        backup_filepath: Path = self.filepath.with_suffix(".backup")
 
         try:
-            # 1. Создание backup существующего файла (если он существует)
-            if self.filepath.exists():
-                try:
-                    shutil.copy2(self.filepath, backup_filepath)
-                    self.logger.debug(f"Создан backup: {backup_filepath}")
-                except Exception as backup_error:
-                    self.logger.warning(f"Не удалось создать backup: {backup_error}")
-                    # Продолжаем без backup
-
-            # 2. Запись данных во временный файл
-            with open(temp_filepath, "w", encoding="utf-8") as f:
-                # Сериализация JSON с форматированием
-                json.dump(
-                    data,
-                    f,
-                    indent=2,
-                    ensure_ascii=False,
-                    default=str,  # Преобразование несериализуемых типов в строки
-                )
-
-            # 3. Проверка целостности записанных данных
-            self._verify_file_integrity(temp_filepath)
-
-            # 4. Атомарное переименование временного файла в основной
+            # 1. Запись данных во временный файл (компактный JSON,
+            # несериализуемые типы преобразуются в строки) и fsync: после
+            # сворачивания журнал сбрасывается, поэтому снимок должен
+            # оказаться на диске раньше
+            payload: bytes = json_codec.dumps(data, default=str)
+            fd: int = os.open(
+                temp_filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644
+            )
+            try:
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(fd, view) :]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+            # 2. Проверка целостности записанных данных (по настройке):
+            # данные сериализованы из уже проверенной структуры в памяти
+            if self._verify_writes:
+                self._verify_file_integrity(temp_filepath)
+
+            # 3. Атомарное переименование временного файла в основной
             temp_filepath.replace(self.filepath)
             self.logger.debug(f"Файл обновлен атомарно: {self.filepath}")
 
-            # 5. Удаление временного файла (если он остался)
-            if temp_filepath.exists():
-                temp_filepath.unlink(missing_ok=True)
-
-            # 6. Удаление backup файла (если операция успешна)
-            if backup_filepath.exists():
-                backup_filepath.unlink(missing_ok=True)
+            # 4. fsync директории - переименование становится устойчивым
+            self._fsync_directory()
 
         except Exception as e:
-            # 7. Восстановление из backup при ошибке
+            # Основной файл не тронут - достаточно удалить временный
             self.logger.error(f"Ошибка атомарной записи: {e}")
-
-            if backup_filepath.exists() and self.filepath.exists():
-                try:
-                    backup_filepath.replace(self.filepath)
-                    self.logger.info("Восстановлено из backup")
-                except Exception as restore_error:
-                    raise StorageError(
-                        f"Ошибка записи и восстановления: {e}, "
-                        f"восстановление не удалось: {restore_error}",
-                        operation="_atomic_write",
-                    ) from restore_error
-            elif backup_filepath.exists():
-                # Если основного файла не было, просто удаляем backup
-                backup_filepath.unlink(missing_ok=True)
-
-            # Удаление временного файла если он существует
-            if temp_filepath.exists():
-                temp_filepath.unlink(missing_ok=True)
+            temp_filepath.unlink(missing_ok=True)
 
             # Проброс исключения дальше
             raise StorageError(
                 f"Ошибка атомарной записи: {e}", operation="_atomic_write"
             ) from e
 
+    def _fsync_directory(self) -> None:
+        """Сбросить на диск запись директории основного файла (POSIX).
+
+        Note:
+            На платформах без поддержки открытия директорий (Windows)
+            ничего не делает.
+        """
+        try:
+            dir_fd: int = os.open(self.filepath.parent, os.O_RDONLY)
+        except OSError:
+            return  # Открытие директории не поддерживается
+        try:
+            os.fsync(dir_fd)
+        except OSError as e:
+            self.logger.debug(f"fsync директории не выполнен: {e}")
+        finally:
+            os.close(dir_fd)
+
     def _verify_file_integrity(self, filepath: Path) -> None:
         """Проверка целостности записанного файла.
 
@@ -754,8 +1163,7 @@ class HistoryStorage:
 
         try:
             # Попытка загрузить и проверить JSON
-            with open(filepath, "r", encoding="utf-8") as f:
-                test_data: Dict[str, Any] = json.load(f)
+            test_data: Dict[str, Any] = json_codec.loads(filepath.read_bytes())
 
             # Проверка структуры загруженных данных
             if not self._validate_data_structure(test_data):
@@ -764,8 +1172,8 @@ class HistoryStorage:
                     operation="_verify_file_integrity",
                 )
 
-        except json.JSONDecodeError as e:
-            # Ошибка парсинга JSON
+        except ValueError as e:
+            # Ошибка парсинга JSON (json и orjson JSONDecodeError)
             raise StorageError(
                 f"Некорректный JSON во временном файле: {e}",
                 operation="_verify_file_integrity",
@@ -777,6 +1185,71 @@ class HistoryStorage:
             ) from e
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_timestamp(timestamp: str) -> float:
+    """Преобразовать ISO timestamp в epoch-секунды для сравнения.
+
+    Args:
+        timestamp: Время в ISO формате (например, "2025-10-10T12:00:00Z")
+
+    Returns:
+        Unix-время; время без часового пояса считается локальным
+
+    Raises:
+        ValueError: При некорректном формате timestamp
+
+    Note:
+        datetime.fromisoformat в Python 3.11+ сам разбирает суффикс "Z",
+        поэтому замена на "+00:00" (лишняя строка) не нужна. Записи одного
+        пакета обновления имеют одинаковый timestamp - результат кэшируется.
+    """
+    return datetime.fromisoformat(timestamp).timestamp()
+
+
+def _first_missing(
+    record: Dict[str, Any], fields: Tuple[str, ...], required: FrozenSet[str]
+) -> Optional[str]:
+    """Найти первое отсутствующее обязательное поле записи.
+
+    Args:
+        record: Проверяемый словарь
+        fields: Обязательные поля в порядке проверки
+        required: Те же поля в виде frozenset (строится один раз в классе)
+
+    Returns:
+        Имя первого отсутствующего поля или None, если все поля есть
+
+    Note:
+        Быстрый путь - одна проверка подмножества над видом ключей
+        (цикл выполняется в C). Поэлементный обход нужен только при ошибке,
+        чтобы сообщение называло то же поле, что и раньше.
+    """
+    if required <= record.keys():
+        return None
+    for field in fields:
+        if field not in record:
+            return field
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _normalize_code(currency_code: str) -> str:
+    """Нормализовать код валюты (верхний регистр, без пробелов по краям).
+
+    Args:
+        currency_code: Код валюты в произвольном регистре
+
+    Returns:
+        Нормализованный код валюты
+
+    Note:
+        Набор кодов мал, а один и тот же код нормализуется при генерации ID,
+        валидации, индексации и поиске - результат берется из кэша вместо
+        создания новых строк на каждом вызове.
+    """
+    return currency_code.upper().strip()
+
+
 # Экспорт публичных классов модуля
 __all__ = [
     "StorageError",  # Исключение для ошибок работы хранилища
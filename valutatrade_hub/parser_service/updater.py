@@ -3,14 +3,22 @@
 """
 
 import logging
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+import mmap
+import os
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
 from .api_clients import BaseApiClient
+from .rates_cache import _is_newer_timestamp, _utc_now_iso
 from .storage import HistoryStorage, StorageError
 from valutatrade_hub.core.exceptions import ApiRequestError
+from valutatrade_hub.infra import json_codec
+from valutatrade_hub.infra.settings import SettingsLoader
 
 from .api_clients import (
     CoinGeckoClient,  # Криптовалюты (есть)
@@ -40,6 +48,14 @@ class UpdateResult:
 class RatesUpdater:
     """Координатор процесса обновления курсов валют из всех источников."""
 
+    # Предел пакетов истории, ожидающих фонового потока записи: при
+    # заполнении очереди опрос ждет хранилище, а не копит память
+    HISTORY_QUEUE_MAXSIZE: int = 64
+
+    # Файлы кэша меньше этого размера читаются целиком: для них создание
+    # отображения дороже одной копии в bytes
+    CACHE_MMAP_MIN_SIZE: int = 4096
+
     def __init__(
         self,
         clients: List[BaseApiClient],
@@ -58,15 +74,52 @@ class RatesUpdater:
             Кэш rates.json обновляется всегда при успешном получении данных.
         """
         self.clients: List[BaseApiClient] = clients  # API клиенты для получения данных
+        # Индекс клиентов по имени без учета регистра для run_update_for_source
+        # (при совпадении имен, как и при прежнем поиске, берется первый)
+        self._clients_by_name: Dict[str, BaseApiClient] = {}
+        for client in clients:
+            self._clients_by_name.setdefault(client.name.casefold(), client)
         self.history_storage: Optional[HistoryStorage] = (
             history_storage  # Хранилище истории
         )
         self.cache_filepath: str = cache_filepath  # Путь к файлу кэша
+        # fsync файла кэша - та же настройка, что и у RatesCache
+        self._fsync_cache: bool = SettingsLoader().get("cache_fsync", False)
+        # Последнее записанное содержимое кэша и отметка (inode, mtime_ns,
+        # размер) файла после записи: пока файл не изменен другим процессом
+        # (например, RatesCache), повторный вызов _update_cache не перечитывает
+        # его. Inode различает атомарную замену файла с теми же mtime и
+        # размером. Вызовы _update_cache последовательны (поток run_update)
+        self._cache_state: Optional[Dict[str, Any]] = None
+        self._cache_stamp: Optional[Tuple[int, int, int]] = None
+        # Фоновая запись истории: пакеты записей (None - сигнал остановки)
+        # сохраняет один поток, поэтому HistoryStorage по-прежнему пишет
+        # единственный поток, а сеть и диск не ждут друг друга
+        self._history_queue: "queue.Queue[Optional[List[Dict[str, Any]]]]" = (
+            queue.Queue(maxsize=self.HISTORY_QUEUE_MAXSIZE)
+        )
+        self._history_thread: Optional[threading.Thread] = None
 
         # Инициализация логгера для операций обновления
         self.logger: logging.Logger = logging.getLogger("parser.updater")
 
-        self.logger.info(f"Инициализирован RatesUpdater с {len(clients)} клиентами")
+        self.logger.info("Инициализирован RatesUpdater с %d клиентами", len(clients))
+
+    def close(self) -> None:
+        """Освободить ресурсы координатора (HTTP-сессии API клиентов).
+
+        Note:
+            Дожидается записи поставленных в очередь пакетов истории,
+            затем журнал исторического хранилища сворачивается в основной файл.
+        """
+        if self._history_thread is not None and self._history_thread.is_alive():
+            self._history_queue.put(None)  # Сигнал остановки после всех пакетов
+            self._history_thread.join()
+        self._history_thread = None
+        for client in self.clients:
+            client.close()
+        if self.history_storage is not None:
+            self.history_storage.close()
 
     def get_clients(self) -> List[BaseApiClient]:
         """Создать и вернуть список всех API-клиентов.
@@ -90,59 +143,54 @@ class RatesUpdater:
 
         Raises:
             ApiRequestError: Если все клиенты завершились с ошибкой
-            StorageError: При ошибках сохранения в историческое хранилище
 
         Note:
-            Метод последовательно опрашивает всех клиентов, объединяет данные
+            Метод опрашивает всех клиентов параллельно, объединяет данные
             и сохраняет их в кэш rates.json и историческое хранилище.
+            Ошибка записи истории логируется и не делает источник неудачным:
+            его курсы все равно попадают в кэш.
         """
         self.logger.info("Начало полного обновления курсов")
 
+        # Одно чтение часов на весь цикл: кэш, история и last_refresh всех
+        # источников получают одинаковую метку начала обновления
+        current_time: str = _utc_now_iso()
+
         all_rates: Dict[str, Dict[str, Any]] = {}  # Словарь для объединенных данных
         updated_sources: List[str] = []  # Успешные источники
         failed_sources: List[str] = []  # Неудачные источники
         error_messages: List[str] = []  # Сообщения об ошибках
 
-        # 1. Последовательный опрос всех клиентов
-        for client in self.clients:
-            try:
-                self.logger.info(f"Опрос источника: {client.name}")
-
-                # Получение курсов от клиента
-                rates: Dict[str, float] = client.fetch_rates()
-
-                # Преобразование формата данных
-                formatted_rates: Dict[str, Dict[str, Any]] = (
-                    self._format_rates_for_cache(rates, client.name)
-                )
-
-                # Объединение данных (новые данные перезаписывают старые)
+        # 1. Параллельный опрос всех клиентов: запросы к разным API независимы,
+        # поэтому время опроса равно самому медленному источнику, а не сумме.
+        # Ответы обрабатываются по мере готовности (as_completed): сохранение
+        # истории быстрого источника идет, пока медленный еще отвечает
+        outcomes: Dict[int, Tuple[Optional[Dict[str, Any]], Optional[str]]] = {}
+        if self.clients:
+            with ThreadPoolExecutor(max_workers=len(self.clients)) as executor:
+                futures: Dict[Future, int] = {}
+                for index, client in enumerate(self.clients):
+                    self.logger.info("Опрос источника: %s", client.name)
+                    futures[executor.submit(client.fetch_rates)] = index
+
+                # Результаты разбираются в основном потоке - запись в
+                # историческое хранилище остается последовательной
+                for future in as_completed(futures):
+                    index = futures[future]
+                    outcomes[index] = self._collect_result(
+                        self.clients[index], future, current_time
+                    )
+
+        # Слияние в порядке клиентов (детерминированно, как и раньше: данные
+        # последующих источников перезаписывают данные предыдущих)
+        for index, client in enumerate(self.clients):
+            formatted_rates, error_msg = outcomes[index]
+            if formatted_rates is not None:
                 all_rates.update(formatted_rates)
                 updated_sources.append(client.name)
-
-                # Сохранение в историческое хранилище (если указано)
-                if self.history_storage:
-                    self._save_to_history(client.name, rates)
-
-                self.logger.info(
-                    f"Источник {client.name}: получено {len(rates)} курсов"
-                )
-
-            except ApiRequestError as e:
-                # Ошибка API клиента - логируем и продолжаем с другими
-                error_msg: str = f"{client.name}: {str(e)}"
-                self.logger.error(error_msg)
-                failed_sources.append(client.name)
-                error_messages.append(error_msg)
-                continue  # Продолжаем со следующим клиентом
-
-            except Exception as e:
-                # Неожиданная ошибка - логируем и продолжаем
-                error_msg: str = f"{client.name}: неожиданная ошибка - {e}"
-                self.logger.error(error_msg, exc_info=True)
+            else:
                 failed_sources.append(client.name)
-                error_messages.append(error_msg)
-                continue
+                error_messages.append(error_msg or client.name)
 
         # 2. Проверка результатов опроса
         if not all_rates:
@@ -153,19 +201,27 @@ class RatesUpdater:
             )
 
         # 3. Обновление кэша rates.json
-        updated_count: int = self._update_cache(all_rates)
+        updated_count: int = self._update_cache(all_rates, current_time)
+
+        # История сохранена к моменту возврата результата (запись шла
+        # параллельно с опросом остальных источников и обновлением кэша)
+        self._wait_for_history()
 
         # 4. Определение статуса операции
         if not failed_sources:
             status: UpdateStatus = UpdateStatus.SUCCESS
             self.logger.info(
-                f"Обновление успешно: {updated_count} курсов из {len(updated_sources)} источников"
+                "Обновление успешно: %d курсов из %d источников",
+                updated_count,
+                len(updated_sources),
             )
         elif updated_sources:
             status = UpdateStatus.PARTIAL
             self.logger.warning(
-                f"Частичный успех: {updated_count} курсов из {len(updated_sources)} источников, "
-                f"ошибок: {len(failed_sources)}"
+                "Частичный успех: %d курсов из %d источников, ошибок: %d",
+                updated_count,
+                len(updated_sources),
+                len(failed_sources),
             )
         else:
             # Этот случай не должен произойти из-за проверки выше, но на всякий случай
@@ -181,6 +237,52 @@ class RatesUpdater:
             error_messages=error_messages,
         )
 
+    def _collect_result(
+        self, client: BaseApiClient, future: Future, current_time: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Обработать результат опроса одного клиента.
+
+        Args:
+            client: Опрошенный API клиент
+            future: Завершенная задача client.fetch_rates
+            current_time: Метка времени цикла обновления
+
+        Returns:
+            Пара (курсы в формате кэша, None) при успехе или
+            (None, сообщение об ошибке) при сбое источника
+
+        Note:
+            Ошибки клиента не пробрасываются: сбой одного источника
+            не прерывает обновление остальных.
+        """
+        try:
+            # Получение курсов от клиента (исключение клиента пробрасывается)
+            rates: Dict[str, float] = future.result()
+
+            # Преобразование формата данных
+            formatted_rates: Dict[str, Dict[str, Any]] = self._format_rates_for_cache(
+                rates, client.name, current_time
+            )
+
+            # Сохранение в историческое хранилище (если указано)
+            if self.history_storage:
+                self._save_to_history(client.name, rates, current_time)
+
+            self.logger.info("Источник %s: получено %d курсов", client.name, len(rates))
+            return formatted_rates, None
+
+        except ApiRequestError as e:
+            # Ошибка API клиента - логируем и продолжаем с другими
+            error_msg: str = f"{client.name}: {str(e)}"
+            self.logger.error(error_msg)
+            return None, error_msg
+
+        except Exception as e:
+            # Неожиданная ошибка - логируем и продолжаем
+            error_msg = f"{client.name}: неожиданная ошибка - {e}"
+            self.logger.error(error_msg, exc_info=True)
+            return None, error_msg
+
     def run_update_for_source(self, source_name: str) -> UpdateResult:
         """Выполнить обновление курсов только для указанного источника.
 
@@ -197,14 +299,12 @@ class RatesUpdater:
         Note:
             Полезно для отладки или выборочного обновления конкретного источника.
         """
-        self.logger.info(f"Выборочное обновление для источника: {source_name}")
+        self.logger.info("Выборочное обновление для источника: %s", source_name)
 
-        # Поиск клиента по имени
-        target_client: Optional[BaseApiClient] = None
-        for client in self.clients:
-            if client.name.lower() == source_name.lower():
-                target_client = client
-                break
+        # Поиск клиента по имени в индексе
+        target_client: Optional[BaseApiClient] = self._clients_by_name.get(
+            source_name.casefold()
+        )
 
         if target_client is None:
             # Клиент с указанным именем не найден
@@ -217,14 +317,17 @@ class RatesUpdater:
         failed_sources: List[str] = []  # Неудачные источники
         error_messages: List[str] = []  # Сообщения об ошибках
 
+        # Одна метка времени для кэша, истории и last_refresh
+        current_time: str = _utc_now_iso()
+
         try:
             # Получение курсов от выбранного клиента
-            self.logger.info(f"Опрос источника: {target_client.name}")
+            self.logger.info("Опрос источника: %s", target_client.name)
             rates: Dict[str, float] = target_client.fetch_rates()
 
             # Преобразование формата данных
             formatted_rates: Dict[str, Dict[str, Any]] = self._format_rates_for_cache(
-                rates, target_client.name
+                rates, target_client.name, current_time
             )
 
             # Объединение данных
@@ -233,10 +336,10 @@ class RatesUpdater:
 
             # Сохранение в историческое хранилище (если указано)
             if self.history_storage:
-                self._save_to_history(target_client.name, rates)
+                self._save_to_history(target_client.name, rates, current_time)
 
             self.logger.info(
-                f"Источник {target_client.name}: получено {len(rates)} курсов"
+                "Источник %s: получено %d курсов", target_client.name, len(rates)
             )
 
         except ApiRequestError as e:
@@ -256,17 +359,22 @@ class RatesUpdater:
             raise
 
         # Обновление кэша rates.json
-        updated_count: int = self._update_cache(all_rates)
+        updated_count: int = self._update_cache(all_rates, current_time)
+
+        # История сохранена к моменту возврата результата
+        self._wait_for_history()
 
         # Определение статуса операции
         if not failed_sources:
             status: UpdateStatus = UpdateStatus.SUCCESS
             self.logger.info(
-                f"Выборочное обновление успешно: {updated_count} курсов из {source_name}"
+                "Выборочное обновление успешно: %d курсов из %s",
+                updated_count,
+                source_name,
             )
         else:
             status = UpdateStatus.FAILED
-            self.logger.error(f"Выборочное обновление не удалось: {source_name}")
+            self.logger.error("Выборочное обновление не удалось: %s", source_name)
 
         # Возврат результата операции
         return UpdateResult(
@@ -278,129 +386,248 @@ class RatesUpdater:
         )
 
     def _format_rates_for_cache(
-        self, rates: Dict[str, float], source: str
+        self,
+        rates: Dict[str, float],
+        source: str,
+        current_time: Optional[str] = None,
     ) -> Dict[str, Dict[str, Any]]:
         """Преобразовать сырые курсы в формат для кэша rates.json.
 
         Args:
             rates: Сырые курсы в формате {"FROM_TO": rate}
             source: Источник данных (например, "CoinGecko")
+            current_time: Метка времени обновления (по умолчанию - текущая)
 
         Returns:
             Словарь в формате для rates.json с метаданными
         """
-        current_time: str = datetime.now().isoformat() + "Z"
-        formatted_rates: Dict[str, Dict[str, Any]] = {}
-
-        for pair, rate in rates.items():
-            formatted_rates[pair] = {
-                "rate": float(rate),  # Числовое значение курса
-                "updated_at": current_time,  # Время обновления
-                "source": source,  # Источник данных
-            }
-
-        return formatted_rates
-
-    def _save_to_history(self, source: str, rates: Dict[str, float]) -> None:
+        if current_time is None:
+            current_time = _utc_now_iso()
+        # Сборка в одном включении: rate - число, updated_at - время
+        # обновления, source - источник данных
+        return {
+            pair: {"rate": float(rate), "updated_at": current_time, "source": source}
+            for pair, rate in rates.items()
+        }
+
+    def _save_to_history(
+        self,
+        source: str,
+        rates: Dict[str, float],
+        current_time: Optional[str] = None,
+    ) -> None:
         """Сохранить курсы в историческое хранилище.
 
         Args:
             source: Источник данных
             rates: Словарь курсов в формате {"FROM_TO": rate}
-
-        Raises:
-            StorageError: При ошибках сохранения в историческое хранилище
+            current_time: Метка времени записей (та же, что и в кэше;
+                по умолчанию - текущая)
 
         Note:
             Создает записи для каждой валютной пары с метаданными.
             Используется только если history_storage был передан при инициализации.
+            Запись выполняет фоновый поток (ошибки хранилища логируются);
+            run_update дожидается ее перед возвратом результата.
         """
         if self.history_storage is None:
             return  # Историческое хранилище не указано
 
         try:
-            current_time: str = datetime.now().isoformat() + "Z"
+            if current_time is None:
+                current_time = _utc_now_iso()
             records: List[Dict[str, Any]] = []
 
+            append = records.append
             for pair, rate in rates.items():
-                # Парсинг пары валют (формат "FROM_TO")
-                if "_" not in pair:
-                    self.logger.warning(f"Некорректный формат пары: {pair}")
+                # Парсинг пары валют (формат "FROM_TO"): partition не создает
+                # список частей; пара без второй валюты пропускается, а не
+                # проваливает валидацию всего пакета
+                from_currency, _, to_currency = pair.partition("_")
+                if not to_currency:
+                    self.logger.warning("Некорректный формат пары: %s", pair)
                     continue
 
-                from_currency, to_currency = pair.split("_", 1)
-
                 # Создание записи для исторического хранилища
-                record: Dict[str, Any] = {
-                    "from_currency": from_currency,
-                    "to_currency": to_currency,
-                    "rate": float(rate),
-                    "timestamp": current_time,
-                    "source": source,
-                    "meta": {
-                        "operation": "automatic_update",
-                        "client_name": source,
-                        "pair": pair,
-                    },
-                }
-                records.append(record)
-
-            # Пакетное сохранение записей
-            if records:
-                saved_ids: List[str] = self.history_storage.save_batch(records)
-                self.logger.debug(
-                    f"Сохранено {len(saved_ids)} записей в историческое хранилище"
+                append(
+                    {
+                        "from_currency": from_currency,
+                        "to_currency": to_currency,
+                        "rate": float(rate),
+                        "timestamp": current_time,
+                        "source": source,
+                        "meta": {
+                            "operation": "automatic_update",
+                            "client_name": source,
+                            "pair": pair,
+                        },
+                    }
                 )
 
-        except StorageError as e:
-            # Ошибка сохранения в историческое хранилище
-            self.logger.error(f"Ошибка сохранения истории: {e}")
-            raise  # Пробрасываем исключение дальше
+            # Пакет передается фоновому потоку записи
+            if records:
+                self._enqueue_history(records)
 
         except Exception as e:
             # Неожиданная ошибка при сохранении истории
             self.logger.error(
-                f"Неожиданная ошибка при сохранении истории: {e}", exc_info=True
+                "Неожиданная ошибка при сохранении истории: %s", e, exc_info=True
             )
             # Не пробрасываем исключение чтобы не прерывать основную операцию
 
-    def _update_cache(self, rates: Dict[str, Dict[str, Any]]) -> int:
+    def _enqueue_history(self, records: List[Dict[str, Any]]) -> None:
+        """Передать пакет записей истории фоновому потоку записи.
+
+        Args:
+            records: Записи для HistoryStorage.save_batch
+        """
+        # Ленивый запуск потока записи
+        if self._history_thread is None or not self._history_thread.is_alive():
+            self._history_thread = threading.Thread(
+                target=self._history_writer_loop,
+                name="rates-history-writer",
+                daemon=True,
+            )
+            self._history_thread.start()
+        self._history_queue.put(records)
+
+    def _history_writer_loop(self) -> None:
+        """Цикл фонового потока: сохранять пакеты истории из очереди."""
+        while True:
+            records = self._history_queue.get()
+            try:
+                if records is None:
+                    return  # Сигнал остановки из close()
+                if self.history_storage is None:
+                    continue
+                # Словари созданы в _save_to_history, поэтому копировать их
+                # перед проставлением ID не нужно
+                saved_ids: List[str] = self.history_storage.save_batch(
+                    records, fast_mode=True
+                )
+                self.logger.debug(
+                    "Сохранено %d записей в историческое хранилище", len(saved_ids)
+                )
+            except StorageError as e:
+                # В фоновом потоке исключение некому обработать
+                self.logger.error("Ошибка сохранения истории: %s", e)
+            except Exception as e:
+                self.logger.error(
+                    "Неожиданная ошибка при сохранении истории: %s", e, exc_info=True
+                )
+            finally:
+                self._history_queue.task_done()
+
+    def _wait_for_history(self) -> None:
+        """Дождаться сохранения всех поставленных в очередь пакетов истории."""
+        if self._history_thread is not None:
+            self._history_queue.join()
+
+    def _read_cache_file(self, cache_path: Path) -> Any:
+        """Прочитать и распарсить файл кэша (крупный - через mmap).
+
+        Args:
+            cache_path: Путь к файлу rates.json
+
+        Returns:
+            Распарсенные данные файла кэша
+
+        Raises:
+            ValueError: При пустом файле или некорректном JSON
+            OSError: При ошибках открытия или отображения файла
+        """
+        with open(cache_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < self.CACHE_MMAP_MIN_SIZE:
+                # Небольшой (или пустой - mmap его не отобразит) файл
+                return json_codec.loads(f.read())
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # orjson разбирает страницы page cache без копии в bytes;
+                # memoryview освобождается до закрытия mmap
+                with memoryview(mm) as view:
+                    return json_codec.loads(view)
+
+    @staticmethod
+    def _cache_file_stamp(cache_path: Path) -> Optional[Tuple[int, int, int]]:
+        """Получить отметку версии файла кэша.
+
+        Args:
+            cache_path: Путь к файлу rates.json
+
+        Returns:
+            (st_ino, st_mtime_ns, st_size) или None, если файла нет
+        """
+        try:
+            st = os.stat(cache_path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _fsync_directory(self, directory: Path) -> None:
+        """Сбросить на диск запись директории после переименования (POSIX).
+
+        Args:
+            directory: Директория файла кэша
+
+        Note:
+            Там, где директорию нельзя открыть (Windows), ничего не делает;
+            ошибка fsync только логируется - файл кэша уже заменен.
+        """
+        try:
+            dir_fd: int = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return  # Открытие директории не поддерживается
+        try:
+            os.fsync(dir_fd)
+        except OSError as e:
+            self.logger.debug("fsync директории кэша не выполнен: %s", e)
+        finally:
+            os.close(dir_fd)
+
+    def _update_cache(
+        self, rates: Dict[str, Dict[str, Any]], current_time: Optional[str] = None
+    ) -> int:
         """Обновить кэш rates.json с новыми данными.
 
         Args:
             rates: Словарь с курсами в формате для кэша
+            current_time: Метка last_refresh (по умолчанию - текущее время)
 
         Returns:
             Количество обновленных/добавленных курсов
 
         Raises:
             IOError: При ошибках чтения/записи файла кэша
-            json.JSONDecodeError: При некорректном формате существующего файла
 
         Note:
             Обновляет только те курсы, которые свежее текущих или отсутствуют.
             Сохраняет данные в формате ТЗ4 с полями pairs и last_refresh.
+            JSON пишется компактно через json_codec (orjson, если установлен),
+            как и в RatesCache, который ведет тот же файл.
         """
         try:
-            import json
-            from pathlib import Path
-
             cache_path: Path = Path(self.cache_filepath)
-            current_time: str = datetime.now().isoformat() + "Z"
+            if current_time is None:
+                current_time = _utc_now_iso()
 
             # 1. Загрузка существующих данных или создание новой структуры
             existing_data: Dict[str, Any] = {}
-            if cache_path.exists():
+            file_stamp: Optional[Tuple[int, int, int]] = self._cache_file_stamp(
+                cache_path
+            )
+            if file_stamp is not None and file_stamp == self._cache_stamp:
+                # Файл не менялся с нашей последней записи - данные в памяти
+                # актуальны, чтение и разбор файла не нужны
+                existing_data = self._cache_state  # type: ignore[assignment]
+            elif file_stamp is not None:
                 try:
-                    with open(cache_path, "r", encoding="utf-8") as f:
-                        existing_data = json.load(f)
+                    existing_data = self._read_cache_file(cache_path)
 
                     # Проверка структуры существующих данных
                     if not isinstance(existing_data, dict):
                         existing_data = {}  # Некорректная структура - сбрасываем
 
-                except (json.JSONDecodeError, IOError) as e:
-                    self.logger.warning(f"Ошибка загрузки кэша, создается новый: {e}")
+                except (ValueError, OSError) as e:
+                    self.logger.warning("Ошибка загрузки кэша, создается новый: %s", e)
                     existing_data = {}
 
             # 2. Инициализация структуры данных если она пустая или некорректная
@@ -422,7 +649,7 @@ class RatesUpdater:
                     # Пара отсутствует - добавляем
                     existing_data["pairs"][pair] = new_data
                     updated_count += 1
-                    self.logger.debug(f"Добавлена новая пара: {pair}")
+                    self.logger.debug("Добавлена новая пара: %s", pair)
 
                 else:
                     # Пара существует - сравниваем время обновления
@@ -430,26 +657,20 @@ class RatesUpdater:
                     new_time_str: str = new_data.get("updated_at", "")
 
                     try:
-                        # Парсинг времени для сравнения
-                        existing_time = datetime.fromisoformat(
-                            existing_time_str.replace("Z", "+00:00")
-                        )
-                        new_time = datetime.fromisoformat(
-                            new_time_str.replace("Z", "+00:00")
-                        )
-
-                        # Обновляем только если новые данные свежее
-                        if new_time > existing_time:
+                        # Обновляем только если новые данные свежее (строки
+                        # одного формата сравниваются без разбора - общий
+                        # помощник RatesCache)
+                        if _is_newer_timestamp(new_time_str, existing_time_str):
                             existing_data["pairs"][pair] = new_data
                             updated_count += 1
-                            self.logger.debug(f"Обновлена пара: {pair}")
+                            self.logger.debug("Обновлена пара: %s", pair)
 
-                    except (ValueError, TypeError):
+                    except (ValueError, TypeError, AttributeError):
                         # Некорректный формат времени - обновляем в любом случае
                         existing_data["pairs"][pair] = new_data
                         updated_count += 1
                         self.logger.debug(
-                            f"Обновлена пара (некорректное время): {pair}"
+                            "Обновлена пара (некорректное время): %s", pair
                         )
 
             # 4. Обновление времени последнего обновления
@@ -458,37 +679,52 @@ class RatesUpdater:
             # 5. Атомарная запись в файл через временный файл
             temp_path: Path = cache_path.with_suffix(".tmp")
 
-            # Запись во временный файл
-            with open(temp_path, "w", encoding="utf-8") as f:
-                json.dump(existing_data, f, indent=2, ensure_ascii=False, default=str)
+            # Сериализация до открытия файла: ошибка кодирования не оставит
+            # на диске недописанный временный файл. Повторное чтение файла для
+            # проверки не нужно - байты получены из корректного dict
+            payload: bytes = json_codec.dumps(existing_data, default=str)
 
-            # Проверка целостности записанных данных
             try:
-                with open(temp_path, "r", encoding="utf-8") as f:
-                    test_data = json.load(f)
-
-                # Базовая проверка структуры
-                if not isinstance(test_data, dict) or "pairs" not in test_data:
-                    raise ValueError("Некорректная структура данных после записи")
+                # Запись во временный файл (готовые байты, без текстового слоя)
+                with open(temp_path, "wb") as f:
+                    f.write(payload)
+                    if self._fsync_cache:
+                        # Устойчивость к сбою питания - по настройке cache_fsync
+                        f.flush()
+                        os.fsync(f.fileno())
 
                 # Атомарное переименование временного файла
-                temp_path.replace(cache_path)
-                self.logger.debug(f"Кэш обновлен атомарно: {cache_path}")
+                os.replace(temp_path, cache_path)
+                self.logger.debug("Кэш обновлен атомарно: %s", cache_path)
+
+            except OSError:
+                # Основной файл не тронут - удаляем временный
+                temp_path.unlink(missing_ok=True)
+                raise
 
-            except (json.JSONDecodeError, ValueError) as e:
-                # Ошибка проверки целостности - удаляем временный файл
-                if temp_path.exists():
-                    temp_path.unlink(missing_ok=True)
-                raise IOError(f"Ошибка проверки целостности кэша: {e}") from e
+            # fsync данных без fsync директории не защищает новое имя файла:
+            # после сбоя мог бы остаться прежний rates.json
+            if self._fsync_cache:
+                self._fsync_directory(cache_path.parent)
+
+            # Запоминание записанного состояния для следующего вызова
+            self._cache_state = existing_data
+            self._cache_stamp = self._cache_file_stamp(cache_path)
 
             # 6. Логирование результатов обновления кэша
             self.logger.info(
-                f"Кэш обновлен: {updated_count} курсов, "
-                f"всего пар в кэше: {len(existing_data['pairs'])}"
+                "Кэш обновлен: %d курсов, всего пар в кэше: %d",
+                updated_count,
+                len(existing_data["pairs"]),
             )
 
             return updated_count
 
         except Exception as e:
-            self.logger.error(f"Критическая ошибка обновления кэша: {e}", exc_info=True)
+            # Состояние в памяти могло быть изменено без записи в файл
+            self._cache_state = None
+            self._cache_stamp = None
+            self.logger.error(
+                "Критическая ошибка обновления кэша: %s", e, exc_info=True
+            )
             raise